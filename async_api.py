@@ -0,0 +1,128 @@
+"""
+PowerPoint Text Modifier asyncio API
+Runs the blocking render functions on an executor so they can be awaited
+from an asyncio service without freezing the event loop.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Iterable, NamedTuple, Optional
+
+from main import render
+
+
+class RenderJob(NamedTuple):
+    """A single render request for render_many()."""
+    input_file: str
+    output_file: str
+    replacements: Dict[str, str]
+    timeout: Optional[float] = None
+    options: Optional[Dict[str, Any]] = None
+
+
+class RenderResult(NamedTuple):
+    """Outcome of a RenderJob; error is set instead of raising."""
+    job: RenderJob
+    replacement_count: int = 0
+    error: Optional[BaseException] = None
+
+
+def _submit(executor: Optional[Executor], input_file: str, output_file: str,
+            replacements: Dict[str, str], options: Dict[str, Any]) -> asyncio.Future:
+    """Start a render on the executor, returning the future of the underlying call."""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, functools.partial(render, input_file, output_file,
+                                                            replacements, **options))
+
+
+async def render_async(input_file: str, output_file: str, replacements: Dict[str, str],
+                       executor: Optional[Executor] = None,
+                       timeout: Optional[float] = None, **options) -> int:
+    """Render a .ppt or .pptx file on an executor and await the result.
+
+    Args:
+        executor: Executor to run the render on (default: the loop's default executor).
+            Use a ProcessPoolExecutor to render several .pptx files in parallel.
+        timeout: Seconds to wait before raising asyncio.TimeoutError.
+        **options: Keyword options passed on to render(), e.g. rows or optimize_media.
+
+    A timed out or cancelled job stops being awaited, but a render that has already
+    started on a thread keeps running until it finishes.
+
+    Returns:
+        Number of text replacements made
+    """
+    future = _submit(executor, input_file, output_file, replacements, options)
+    return await asyncio.wait_for(future, timeout)
+
+
+async def _run_job(job: RenderJob, executor: Optional[Executor],
+                   timeout: Optional[float], slots: asyncio.Semaphore) -> RenderResult:
+    """Run one job, capturing its error in the result.
+
+    The job takes a slot before it starts and gives it back only once the render
+    itself has finished, so a timed out render keeps its slot while it runs on.
+    """
+    if job.timeout is not None:
+        timeout = job.timeout
+    await slots.acquire()
+    try:
+        future = _submit(executor, job.input_file, job.output_file, job.replacements,
+                         job.options or {})
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        count = await asyncio.wait_for(asyncio.shield(future), timeout)
+        return RenderResult(job, count)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        return RenderResult(job, error=e)
+
+
+async def render_many(jobs: Iterable, executor: Optional[Executor] = None,
+                      concurrency: int = 4,
+                      timeout: Optional[float] = None) -> AsyncIterator[RenderResult]:
+    """Render many files, yielding a RenderResult as each one finishes.
+
+    Args:
+        jobs: RenderJob instances or (input_file, output_file, replacements[, timeout[, options]])
+            tuples. Jobs are pulled lazily, so a generator of any size is fine.
+        executor: Executor to run the renders on (default: the loop's default executor).
+        concurrency: Maximum number of renders running at once, counting timed out
+            renders that are still running on the executor.
+        timeout: Default per-job timeout in seconds; a job's own timeout overrides it.
+
+    Failed or timed out jobs are yielded with their error set. Leaving the loop early
+    or cancelling the consuming task cancels all jobs that are still pending.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    slots = asyncio.Semaphore(concurrency)
+    job_iter = iter(jobs)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            # Keep the window full without queueing the whole batch up front
+            while not exhausted and len(pending) < concurrency:
+                job = next(job_iter, None)
+                if job is None:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(_run_job(RenderJob(*job), executor, timeout, slots))
+                pending.add(task)
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for pptmod.
+Generates test decks and measures the render engines, saving results under bench_results/.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from pathlib import Path
+
+
+RESULTS_DIR = Path("bench_results")
+REPLACEMENTS = {
+    "{{NAME}}": "John Doe",
+    "{{COMPANY}}": "Acme Corporation",
+    "{{DATE}}": "November 29, 2025",
+}
+
+# Generated deck sizes: name -> (slides, MB of embedded media)
+DECK_SIZES = {
+    "small": (10, 1),
+    "medium": (50, 20),
+    "large": (200, 100),
+}
+
+
+def generate_deck(path: str, slides: int, media_mb: int) -> None:
+    """Create a deck with placeholder text on every slide and one embedded video of media_mb MB."""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    for index in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"{{{{COMPANY}}}} report {index + 1}"
+        slide.placeholders[1].text = "Prepared for {{NAME}} on {{DATE}}"
+        table = slide.shapes.add_table(3, 3, Inches(1), Inches(5), Inches(6), Inches(1)).table
+        for cell in table.iter_cells():
+            cell.text = "{{NAME}}"
+
+    if media_mb:
+        with tempfile.TemporaryDirectory() as tmp:
+            movie = os.path.join(tmp, "media.mp4")
+            with open(movie, "wb") as f:
+                for _ in range(media_mb):
+                    f.write(os.urandom(1024 * 1024))
+            prs.slides[0].shapes.add_movie(movie, Inches(1), Inches(1), Inches(2), Inches(2),
+                                           mime_type="video/mp4")
+    prs.save(path)
+
+
+def generate_fragmented_deck(path: str, slides: int) -> None:
+    """Create a deck whose text is split into one run per word, as PowerPoint edits tend to leave it."""
+    from pptx import Presentation
+
+    prs = Presentation()
+    words = "Prepared for {{NAME}} at {{COMPANY}} on {{DATE}} by the reporting team".split()
+    for _ in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        for shape in (slide.shapes.title, slide.placeholders[1]):
+            paragraph = shape.text_frame.paragraphs[0]
+            for repeat in range(4):
+                for word in words:
+                    run = paragraph.add_run()
+                    run.text = word + " "
+                    # Spell-check marks differ from run to run in real templates
+                    run.font._rPr.set("err", "1" if repeat % 2 else "0")
+                    run.font._rPr.set("dirty", "0")
+    prs.save(path)
+
+
+def generate_chart_deck(path: str, charts: int) -> None:
+    """Create a deck with one clustered column chart per slide, named Chart1, Chart2..."""
+    from pptx import Presentation
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+    from pptx.util import Inches
+
+    prs = Presentation()
+    for index in range(charts):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        chart_data = CategoryChartData()
+        chart_data.categories = ["East", "West", "Midwest"]
+        chart_data.add_series("Q1", (19.2, 21.4, 16.7))
+        chart_data.add_series("Q2", (22.3, 28.6, 15.2))
+        frame = slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(1), Inches(1),
+                                       Inches(6), Inches(4), chart_data)
+        frame.name = f"Chart{index + 1}"
+    prs.save(path)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+
+    if sys.platform.startswith("linux"):
+        # ru_maxrss survives exec, so a spawned child would report the parent's
+        # peak; VmHWM belongs to the new address space
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+
+    import resource
+    # macOS reports bytes, other platforms KiB
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_engine(engine: str, mode: str, input_file: str, output_file: str) -> dict:
+    """Run one engine in the current process and measure it (called in a fresh child process)."""
+    import main
+
+    if engine == "modify_pptx":
+        run = lambda: main.modify_pptx(input_file, output_file, REPLACEMENTS,
+                                       optimize_media=(mode == "dedupe"))
+    elif engine == "modify_pptx_streaming":
+        run = lambda: main.modify_pptx_streaming(input_file, output_file, REPLACEMENTS)
+    elif engine == "modify_ppt":
+        run = lambda: main.modify_ppt(input_file, output_file, REPLACEMENTS)
+    elif engine == "export_to_pdf":
+        run = lambda: main.export_to_pdf(input_file, output_file)
+    else:
+        raise ValueError(f"Unknown engine '{engine}'")
+
+    baseline_rss = _peak_rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        run()
+    seconds = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(seconds, 3),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "tracemalloc_peak_mb": round(traced_peak / (1024 * 1024), 1),
+    }
+
+
+def _convert_with_powerpoint(input_file: str, output_file: str) -> None:
+    """Save a .pptx as a legacy .ppt using PowerPoint (Windows only)."""
+    import comtypes.client
+
+    powerpoint = comtypes.client.CreateObject("Powerpoint.Application")
+    presentation = powerpoint.Presentations.Open(os.path.abspath(input_file), WithWindow=False)
+    # 1 = ppSaveAsPresentation
+    presentation.SaveAs(os.path.abspath(output_file), 1)
+    presentation.Close()
+    powerpoint.Quit()
+
+
+def check_budget(results: list, budget: dict) -> list:
+    """Compare results against a budget, returning a message per exceeded limit.
+
+    Budget keys are 'engine/mode/size' or 'engine/mode' (applies to all sizes),
+    each mapping metric names (e.g. 'peak_rss_mb') to their limit.
+    """
+    failures = []
+    for result in results:
+        key = f"{result['engine']}/{result['mode']}"
+        limits = budget.get(f"{key}/{result['size']}", budget.get(key, {}))
+        for metric, limit in limits.items():
+            if result[metric] > limit:
+                failures.append(f"{key}/{result['size']}: {metric} {result[metric]} > {limit}")
+    return failures
+
+
+def bench_memory(args) -> int:
+    """Measure peak memory of each engine and mode across deck sizes."""
+    cases = [
+        ("modify_pptx", "standard"),
+        ("modify_pptx", "dedupe"),
+        ("modify_pptx_streaming", "low_memory"),
+    ]
+    if args.com:
+        cases += [("modify_ppt", "com"), ("export_to_pdf", "com")]
+
+    # Each case runs in a fresh process so peak RSS is not shared between cases
+    spawn = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            slides, media_mb = DECK_SIZES[size]
+            deck = os.path.join(tmp, f"{size}.pptx")
+            generate_deck(deck, slides, media_mb)
+            inputs = {".pptx": deck}
+            if args.com:
+                inputs[".ppt"] = os.path.join(tmp, f"{size}.ppt")
+                _convert_with_powerpoint(deck, inputs[".ppt"])
+
+            for engine, mode in cases:
+                input_file = inputs[".ppt" if engine == "modify_ppt" else ".pptx"]
+                suffix = ".pdf" if engine == "export_to_pdf" else Path(input_file).suffix
+                output_file = os.path.join(tmp, f"out{suffix}")
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    measured = pool.submit(_run_engine, engine, mode, input_file, output_file).result()
+
+                result = {"engine": engine, "mode": mode, "size": size,
+                          "slides": slides, "media_mb": media_mb, **measured}
+                results.append(result)
+                print(f"{engine:<22} {mode:<11} {size:<7} peak RSS {result['peak_rss_mb']:>7.1f} MB  "
+                      f"tracemalloc {result['tracemalloc_peak_mb']:>7.1f} MB  {result['seconds']:.2f}s")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output_path = RESULTS_DIR / "memory.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {output_path}")
+
+    if args.budget:
+        with open(args.budget, "r", encoding="utf-8") as f:
+            budget = json.load(f)
+        failures = check_budget(results, budget)
+        if failures:
+            print(f"\nMemory budget exceeded ({args.budget}):", file=sys.stderr)
+            for failure in failures:
+                print(f"  - {failure}", file=sys.stderr)
+            return 1
+        print(f"All results within budget ({args.budget})")
+    return 0
+
+
+def bench_optimize(args) -> int:
+    """Compare render time of a fragmented template before and after optimize-template."""
+    import main
+    from optimize import optimize_template
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for slides in args.slides:
+            fragmented = os.path.join(tmp, f"fragmented{slides}.pptx")
+            optimized = os.path.join(tmp, f"optimized{slides}.pptx")
+            output = os.path.join(tmp, "out.pptx")
+            generate_fragmented_deck(fragmented, slides)
+            stats = optimize_template(fragmented, optimized)
+
+            timings = {}
+            for name, template in (("fragmented", fragmented), ("optimized", optimized)):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        main.modify_pptx(template, output, REPLACEMENTS)
+                    best = min(best, time.perf_counter() - start)
+                timings[name] = round(best, 4)
+
+            result = {"slides": slides, **stats,
+                      "fragmented_seconds": timings["fragmented"],
+                      "optimized_seconds": timings["optimized"]}
+            results.append(result)
+            print(f"{slides:>5} slides  removed {stats['runs_removed']:>7} runs  "
+                  f"render {timings['fragmented']:.3f}s -> {timings['optimized']:.3f}s "
+                  f"({timings['fragmented'] / timings['optimized']:.1f}x)")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output_path = RESULTS_DIR / "optimize.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {output_path}")
+    return 0
+
+
+def bench_charts(args) -> int:
+    """Compare bulk chart updates: python-pptx replace_data vs bind_charts with and without workbooks."""
+    from pptx import Presentation
+    from pptx.chart.data import CategoryChartData
+    from charts import bind_charts, find_chart_shapes
+
+    categories = ["North", "South", "East", "West"]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.charts:
+            template = os.path.join(tmp, f"charts{count}.pptx")
+            output = os.path.join(tmp, "out.pptx")
+            generate_chart_deck(template, count)
+            data = {
+                f"Chart{index + 1}": {
+                    "categories": categories,
+                    "series": {"Q1": [index, 2.5, 3.5, 4.5], "Q2": [5.5, 6.5, index, 8.5]},
+                }
+                for index in range(count)
+            }
+
+            def replace_data(prs):
+                shapes = find_chart_shapes(prs)
+                for name, chart in data.items():
+                    chart_data = CategoryChartData()
+                    chart_data.categories = chart["categories"]
+                    for series_name, values in chart["series"].items():
+                        chart_data.add_series(series_name, values)
+                    shapes[name].chart.replace_data(chart_data)
+
+            methods = (
+                ("replace_data", replace_data),
+                ("bind_charts", lambda prs: bind_charts(prs, data)),
+                ("cache_only", lambda prs: bind_charts(prs, data, update_workbooks=False)),
+            )
+            timings = {}
+            for name, update in methods:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    prs = Presentation(template)
+                    start = time.perf_counter()
+                    update(prs)
+                    prs.save(output)
+                    best = min(best, time.perf_counter() - start)
+                timings[name] = round(best, 4)
+
+            results.append({"charts": count, **{f"{name}_seconds": seconds for name, seconds in timings.items()}})
+            print(f"{count:>5} charts  replace_data {timings['replace_data']:.3f}s  "
+                  f"bind_charts {timings['bind_charts']:.3f}s  cache-only {timings['cache_only']:.3f}s")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output_path = RESULTS_DIR / "charts.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {output_path}")
+    return 0
+
+
+def bench_delta(args) -> int:
+    """Storage saved by --delta outputs and the time `pptmod materialize` takes to rebuild them."""
+    import main
+    from delta import materialize
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            slides, media_mb = DECK_SIZES[size]
+            template = os.path.join(tmp, f"{size}.pptx")
+            generate_deck(template, slides, media_mb)
+
+            full_bytes = delta_bytes = 0
+            rebuild_seconds = []
+            for variant in range(args.variants):
+                replacements = {**REPLACEMENTS, "{{NAME}}": f"Customer {variant + 1}"}
+                full = os.path.join(tmp, "full.pptx")
+                delta = os.path.join(tmp, f"{size}-{variant}.delta")
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    main.modify_pptx(template, full, replacements)
+                    main.modify_pptx(template, delta, replacements, delta=True)
+                full_bytes += os.path.getsize(full)
+                delta_bytes += os.path.getsize(delta)
+
+                start = time.perf_counter()
+                materialize(delta, os.path.join(tmp, "rebuilt.pptx"), template)
+                rebuild_seconds.append(time.perf_counter() - start)
+
+            rebuild_seconds.sort()
+            result = {
+                "size": size,
+                "variants": args.variants,
+                "full_mb": round(full_bytes / 1024 / 1024, 2),
+                "delta_mb": round(delta_bytes / 1024 / 1024, 3),
+                "saved_percent": round(100 * (1 - delta_bytes / full_bytes), 2),
+                "rebuild_median_seconds": round(rebuild_seconds[len(rebuild_seconds) // 2], 4),
+                "rebuild_max_seconds": round(rebuild_seconds[-1], 4),
+            }
+            results.append(result)
+            print(f"{size:>8}  {args.variants} variants  {result['full_mb']:.1f} MB full -> "
+                  f"{result['delta_mb']:.2f} MB as deltas ({result['saved_percent']:.1f}% saved)  "
+                  f"rebuild {result['rebuild_median_seconds']:.3f}s median")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output_path = RESULTS_DIR / "delta.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {output_path}")
+    return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmarks for pptmod")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    memory_parser = commands.add_parser("memory", help="Peak RSS and tracemalloc peak per engine")
+    memory_parser.add_argument("--sizes", default="small,medium,large",
+                               type=lambda value: value.split(","),
+                               help=f"Deck sizes to generate (from: {', '.join(DECK_SIZES)})")
+    memory_parser.add_argument("--budget", default=None,
+                               help="JSON budget file; exit with an error if any limit is exceeded")
+    memory_parser.add_argument("--com", action="store_true",
+                               help="Also measure modify_ppt and export_to_pdf (needs PowerPoint on Windows)")
+    memory_parser.set_defaults(func=bench_memory)
+
+    optimize_parser = commands.add_parser("optimize", help="Render time before and after optimize-template")
+    optimize_parser.add_argument("--slides", default="50,200",
+                                 type=lambda value: [int(count) for count in value.split(",")],
+                                 help="Slide counts of the generated templates (default: 50,200)")
+    optimize_parser.add_argument("--repeat", type=int, default=3,
+                                 help="Renders per template; the fastest is reported (default: 3)")
+    optimize_parser.set_defaults(func=bench_optimize)
+
+    charts_parser = commands.add_parser("charts", help="Update time for decks with many charts")
+    charts_parser.add_argument("--charts", default="100,500",
+                               type=lambda value: [int(count) for count in value.split(",")],
+                               help="Chart counts of the generated decks (default: 100,500)")
+    charts_parser.add_argument("--repeat", type=int, default=3,
+                               help="Updates per method; the fastest is reported (default: 3)")
+    charts_parser.set_defaults(func=bench_charts)
+
+    delta_parser = commands.add_parser("delta", help="Storage saved by --delta and materialize latency")
+    delta_parser.add_argument("--sizes", default="small,medium",
+                              type=lambda value: value.split(","),
+                              help=f"Deck sizes to generate (from: {', '.join(DECK_SIZES)})")
+    delta_parser.add_argument("--variants", type=int, default=10,
+                              help="Rendered variants per template (default: 10)")
+    delta_parser.set_defaults(func=bench_delta)
+
+    args = parser.parse_args()
+    if hasattr(args, "sizes"):
+        unknown = [size for size in args.sizes if size not in DECK_SIZES]
+        if unknown:
+            parser.error(f"unknown deck size(s): {', '.join(unknown)}")
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
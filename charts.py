@@ -0,0 +1,382 @@
+"""
+Bulk chart binding
+Replaces chart series data in place. The cached values in the chart XML (what
+PowerPoint displays) are always rewritten; the embedded workbook (what "Edit
+Data" opens) is patched cell by cell instead of being regenerated, and can be
+skipped entirely when only the displayed values matter.
+"""
+
+import io
+import json
+import re
+import zipfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from lxml import etree
+from pptx.oxml.ns import qn
+
+from main import iter_shapes
+
+
+_SS_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_R_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+# A cell or range reference such as Sheet1!$B$2:$B$5 or 'My Sheet'!$A$1
+_REFERENCE_PATTERN = re.compile(
+    r"^(?:(?P<sheet>'(?:[^']|'')+'|[^!]+)!)?"
+    r"\$?(?P<col1>[A-Z]+)\$?(?P<row1>\d+)(?::\$?(?P<col2>[A-Z]+)\$?(?P<row2>\d+))?$"
+)
+
+Cell = Tuple[int, int]
+
+
+def load_chart_data(data_path: str) -> Dict[str, Dict[str, Any]]:
+    """Load chart data from a JSON file: {chart name: {"categories": [...], "series": {...}}}."""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        charts = json.load(f)
+    if not isinstance(charts, dict):
+        raise ValueError(f"Chart data file '{data_path}' must contain an object keyed by chart name")
+    return charts
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+def _column_letters(number: int) -> str:
+    letters = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+class _Reference:
+    """A parsed worksheet reference from a chart formula (c:f)."""
+
+    def __init__(self, formula: str):
+        match = _REFERENCE_PATTERN.match(formula.strip())
+        if match is None:
+            raise ValueError(f"Unsupported chart data reference '{formula}'")
+        sheet = match.group('sheet') or ''
+        self.sheet_prefix = f'{sheet}!' if sheet else ''
+        self.sheet = sheet[1:-1].replace("''", "'") if sheet.startswith("'") else sheet
+        self.start = (_column_number(match.group('col1')), int(match.group('row1')))
+        end_col, end_row = match.group('col2'), match.group('row2')
+        self.end = (_column_number(end_col), int(end_row)) if end_col else self.start
+
+    def cells(self) -> List[Cell]:
+        """Cells covered by the reference, in order."""
+        (col1, row1), (col2, row2) = self.start, self.end
+        return [(col, row) for row in range(row1, row2 + 1) for col in range(col1, col2 + 1)]
+
+    def resized(self, length: int) -> '_Reference':
+        """Return a copy covering length cells along the reference's direction."""
+        resized = _Reference(self.formula)
+        col, row = self.start
+        # Single cells and column ranges grow downwards, row ranges to the right
+        if self.start[1] == self.end[1] and self.start[0] != self.end[0]:
+            resized.end = (col + max(length, 1) - 1, row)
+        else:
+            resized.end = (col, row + max(length, 1) - 1)
+        return resized
+
+    @property
+    def formula(self) -> str:
+        (col1, row1), (col2, row2) = self.start, self.end
+        formula = f'{self.sheet_prefix}${_column_letters(col1)}${row1}'
+        if (col1, row1) != (col2, row2):
+            formula += f':${_column_letters(col2)}${row2}'
+        return formula
+
+
+def _format_number(value) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _write_cache(cache, values: Sequence, numeric: bool) -> None:
+    """Rewrite the points of a c:numCache/c:strCache (or literal) element."""
+    for point in cache.findall(qn('c:pt')):
+        cache.remove(point)
+
+    point_count = cache.find(qn('c:ptCount'))
+    if point_count is None:
+        point_count = etree.SubElement(cache, qn('c:ptCount'))
+        format_code = cache.find(qn('c:formatCode'))
+        if format_code is not None:
+            format_code.addnext(point_count)
+    point_count.set('val', str(len(values)))
+
+    previous = point_count
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        point = cache.makeelement(qn('c:pt'), {'idx': str(index)})
+        etree.SubElement(point, qn('c:v')).text = _format_number(value) if numeric else str(value)
+        previous.addnext(point)
+        previous = point
+
+
+def _update_data_source(source, values: Sequence, writes: Dict, clears: Dict) -> None:
+    """Update a c:tx/c:cat/c:val-like element with new values.
+
+    Workbook cells to write and clear are collected per sheet in writes/clears.
+    """
+    reference = source.find(f"*/{qn('c:f')}")
+    for cache_tag, numeric in (('c:numCache', True), ('c:strCache', False),
+                               ('c:numLit', True), ('c:strLit', False)):
+        cache = source.find(f".//{qn(cache_tag)}")
+        if cache is not None:
+            break
+    else:
+        raise ValueError("Chart series data source has no cached values to update")
+
+    if numeric and any(value is not None and not isinstance(value, (int, float)) for value in values):
+        raise ValueError(f"Chart values must be numbers, got {list(values)!r}")
+    _write_cache(cache, values, numeric)
+
+    if reference is None:
+        return
+    old = _Reference(reference.text)
+    new = old.resized(len(values))
+    reference.text = new.formula
+
+    sheet_writes = writes.setdefault(old.sheet, {})
+    new_cells = new.cells()
+    for cell, value in zip(new_cells, values):
+        sheet_writes[cell] = value
+    clears.setdefault(old.sheet, set()).update(set(old.cells()) - set(new_cells))
+
+
+def _series_elements(chart_space) -> List:
+    """Return the chart's c:ser elements in display order."""
+    series = list(chart_space.iter(qn('c:ser')))
+    return sorted(series, key=lambda ser: int(ser.find(qn('c:order')).get('val', 0))
+                  if ser.find(qn('c:order')) is not None else 0)
+
+
+def update_chart_xml(chart_space, categories: Optional[Sequence],
+                     series: Any) -> Tuple[Dict, Dict]:
+    """Rewrite the cached data of a chart's series.
+
+    Args:
+        categories: New category labels (x values for XY charts), or None to keep them.
+        series: Dict of series name -> values, or a list of value lists. Series are
+            matched to the chart's series in order.
+
+    Returns:
+        Workbook cells to write and to clear, each as {sheet name: cells}
+    """
+    writes, clears = {}, {}
+    chart_series = _series_elements(chart_space)
+    if isinstance(series, dict):
+        names, value_lists = list(series.keys()), list(series.values())
+    else:
+        names, value_lists = None, list(series)
+    if len(value_lists) > len(chart_series):
+        raise ValueError(f"Got {len(value_lists)} series but the chart has {len(chart_series)}")
+
+    # Every series carries its own copy of the categories, so update them all
+    if categories is not None:
+        for ser in chart_series:
+            category_source = ser.find(qn('c:cat'))
+            if category_source is None:
+                category_source = ser.find(qn('c:xVal'))
+            if category_source is not None:
+                _update_data_source(category_source, list(categories), writes, clears)
+
+    for index, (ser, values) in enumerate(zip(chart_series, value_lists)):
+        if names is not None:
+            name_source = ser.find(qn('c:tx'))
+            if name_source is not None and name_source.find(qn('c:strRef')) is not None:
+                _update_data_source(name_source, [names[index]], writes, clears)
+
+        value_source = ser.find(qn('c:val'))
+        if value_source is None:
+            value_source = ser.find(qn('c:yVal'))
+        if value_source is None:
+            raise ValueError("Chart series has no values to update")
+        _update_data_source(value_source, list(values), writes, clears)
+
+    return writes, clears
+
+
+def _sheet_paths(workbook_zip: zipfile.ZipFile) -> Dict[str, str]:
+    """Map sheet names to their worksheet part paths in an xlsx package."""
+    workbook = etree.fromstring(workbook_zip.read('xl/workbook.xml'))
+    rels = etree.fromstring(workbook_zip.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{{{_REL_NS}}}Relationship')}
+    paths = {}
+    for sheet in workbook.iter(f'{{{_SS_NS}}}sheet'):
+        target = targets[sheet.get(_R_ID)]
+        paths[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+    return paths
+
+
+def _set_cell(row, cell_ref: str, column: int, value, default_style: Optional[str] = None) -> None:
+    """Set or clear one cell in a worksheet row, keeping cells in column order."""
+    cell = None
+    insert_before = None
+    for existing in row.iter(f'{{{_SS_NS}}}c'):
+        match = re.match(r'[A-Z]+', existing.get('r', ''))
+        existing_column = _column_number(match.group(0)) if match else 0
+        if existing_column == column:
+            cell = existing
+            break
+        if existing_column > column:
+            insert_before = existing
+            break
+
+    if value is None:
+        if cell is not None:
+            row.remove(cell)
+        return
+
+    if cell is None:
+        cell = row.makeelement(f'{{{_SS_NS}}}c', {'r': cell_ref})
+        if default_style is not None:
+            cell.set('s', default_style)
+        if insert_before is not None:
+            insert_before.addprevious(cell)
+        else:
+            row.append(cell)
+
+    style = cell.get('s')
+    cell.attrib.clear()
+    cell.set('r', cell_ref)
+    if style is not None:
+        cell.set('s', style)
+    for child in list(cell):
+        cell.remove(child)
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        etree.SubElement(cell, f'{{{_SS_NS}}}v').text = _format_number(value)
+    else:
+        cell.set('t', 'inlineStr')
+        inline = etree.SubElement(cell, f'{{{_SS_NS}}}is')
+        etree.SubElement(inline, f'{{{_SS_NS}}}t').text = str(value)
+
+
+def _patch_sheet(sheet_xml: bytes, cells: Dict[Cell, Any]) -> bytes:
+    """Write (or with value None, clear) cells in a worksheet XML part."""
+    worksheet = etree.fromstring(sheet_xml)
+    sheet_data = worksheet.find(f'{{{_SS_NS}}}sheetData')
+    rows = {int(row.get('r')): row for row in sheet_data.iter(f'{{{_SS_NS}}}row')}
+
+    # Styles as they are before any cell is cleared, so a new cell can still
+    # copy the style of a cell above it that this pass clears first
+    styles = {}
+    for row_number, row in rows.items():
+        for cell in row.iter(f'{{{_SS_NS}}}c'):
+            match = re.match(r'[A-Z]+', cell.get('r', ''))
+            if match:
+                styles[_column_number(match.group(0)), row_number] = cell.get('s')
+
+    for (column, row_number), value in sorted(cells.items(), key=lambda item: (item[0][1], item[0][0])):
+        row = rows.get(row_number)
+        if row is None:
+            if value is None:
+                continue
+            row = sheet_data.makeelement(f'{{{_SS_NS}}}row', {'r': str(row_number)})
+            following = [number for number in rows if number > row_number]
+            if following:
+                rows[min(following)].addprevious(row)
+            else:
+                sheet_data.append(row)
+            rows[row_number] = row
+        row.attrib.pop('spans', None)
+        # New cells take the number format of the cell above them
+        default_style = styles.get((column, row_number - 1))
+        _set_cell(row, f'{_column_letters(column)}{row_number}', column, value, default_style)
+        if value is not None:
+            styles.setdefault((column, row_number), default_style)
+
+    # Drop rows this pass left without cells
+    for row_number in {row_number for _, row_number in cells}:
+        row = rows.get(row_number)
+        if row is not None and not len(row):
+            sheet_data.remove(row)
+            del rows[row_number]
+
+    # Keep the used-range hint in step with the data
+    dimension = worksheet.find(f'{{{_SS_NS}}}dimension')
+    populated = [number for number, row in rows.items() if len(row)]
+    if dimension is not None and populated:
+        start = dimension.get('ref', 'A1').split(':')[0]
+        max_column = max(
+            _column_number(re.match(r'[A-Z]+', cell.get('r')).group(0))
+            for row in rows.values() for cell in row.iter(f'{{{_SS_NS}}}c')
+        )
+        dimension.set('ref', f'{start}:{_column_letters(max_column)}{max(populated)}')
+
+    return etree.tostring(worksheet, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def patch_workbook(xlsx_blob: bytes, writes: Dict[str, Dict[Cell, Any]],
+                   clears: Dict[str, set]) -> bytes:
+    """Write values into an embedded xlsx package, touching only the affected sheets."""
+    with zipfile.ZipFile(io.BytesIO(xlsx_blob)) as zin:
+        sheet_paths = _sheet_paths(zin)
+        edits = {}
+        for sheet, sheet_writes in writes.items():
+            cells = {cell: None for cell in clears.get(sheet, ())}
+            cells.update(sheet_writes)
+            # Formulas without a sheet name refer to the first sheet
+            path = sheet_paths.get(sheet) or next(iter(sheet_paths.values()))
+            edits[path] = cells
+
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                data = zin.read(info)
+                if info.filename in edits:
+                    data = _patch_sheet(data, edits[info.filename])
+                zout.writestr(info, data)
+    return output.getvalue()
+
+
+def find_chart_shapes(prs) -> Dict[str, Any]:
+    """Return every chart graphic frame in the presentation, keyed by shape name."""
+    return {
+        shape.name: shape
+        for slide in prs.slides
+        for shape in iter_shapes(slide.shapes)
+        if getattr(shape, 'has_chart', False)
+    }
+
+
+def bind_charts(prs, charts: Dict[str, Dict[str, Any]], update_workbooks: bool = True) -> int:
+    """Replace the data of several charts, found by shape name.
+
+    Args:
+        charts: Chart name -> {"categories": [...], "series": {name: values} or [values]}.
+        update_workbooks: Also patch each chart's embedded workbook. Turn off for the
+            fast path when only the displayed values matter; "Edit Data" in
+            PowerPoint will then show the old numbers.
+
+    Returns:
+        Number of charts updated
+    """
+    shapes = find_chart_shapes(prs)
+    missing = [name for name in charts if name not in shapes]
+    if missing:
+        raise ValueError(f"No chart named {', '.join(repr(name) for name in missing)} found in the presentation")
+
+    for name, data in charts.items():
+        chart_part = shapes[name].chart_part
+        writes, clears = update_chart_xml(chart_part._element, data.get('categories'), data['series'])
+
+        if update_workbooks and writes:
+            xlsx_part = chart_part.chart_workbook.xlsx_part
+            if xlsx_part is not None:
+                xlsx_part.blob = patch_workbook(xlsx_part.blob, writes, clears)
+
+    return len(charts)
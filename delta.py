@@ -0,0 +1,171 @@
+"""
+Delta outputs
+Stores a rendered deck as a patch against its template: a zip holding only the
+entries that changed, plus a manifest that names the template by SHA-256 and
+lists where every entry of the full deck comes from. `pptmod materialize`
+rebuilds the full .pptx by copying compressed entries from the two files as
+they are, without inflating anything.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from lxml import etree
+
+from pptzip import copy_entry_raw, file_sha256
+
+
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1
+
+# Changed entries are stored under this prefix so they can't clash with the manifest
+_PART_PREFIX = 'parts/'
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_sha256(path: str, size: int, mtime_ns: int) -> str:
+    """file_sha256, memoized by the file's size and modification time."""
+    return file_sha256(path)
+
+
+def template_sha256(template_file: str) -> str:
+    """Return a template's SHA-256, hashing it again only if the file changed.
+
+    A batch writes many deltas against the same template, so this saves reading
+    the whole template (media included) once per render.
+    """
+    path = os.path.abspath(template_file)
+    stat = os.stat(path)
+    return _cached_sha256(path, stat.st_size, stat.st_mtime_ns)
+
+
+def _same_content(template: zipfile.ZipFile, template_info: zipfile.ZipInfo,
+                  rendered: zipfile.ZipFile, rendered_info: zipfile.ZipInfo) -> bool:
+    """Tell whether an entry is unchanged between the template and the rendered deck.
+
+    Byte-identical entries are recognised from the zip directory alone. python-pptx
+    re-serializes every XML part it loads, so XML parts whose bytes differ are
+    compared in canonical form before being counted as changed.
+    """
+    if template_info.CRC == rendered_info.CRC and template_info.file_size == rendered_info.file_size:
+        return True
+    if not rendered_info.filename.endswith(('.xml', '.rels')):
+        return False
+    try:
+        return (etree.tostring(etree.fromstring(template.read(template_info)), method='c14n')
+                == etree.tostring(etree.fromstring(rendered.read(rendered_info)), method='c14n'))
+    except etree.XMLSyntaxError:
+        return False
+
+
+def write_delta(template_file: str, rendered_file, delta_file: str) -> Dict[str, int]:
+    """Write rendered_file (a path or file object) as a delta against template_file.
+
+    Returns:
+        Stats: 'entries', 'changed_entries' and 'delta_bytes'
+    """
+    manifest = {
+        'format': FORMAT_VERSION,
+        'template': {
+            'name': os.path.basename(template_file),
+            'path': os.path.abspath(template_file),
+            'sha256': template_sha256(template_file),
+        },
+        'entries': [],
+    }
+
+    with zipfile.ZipFile(template_file, 'r') as template, \
+            zipfile.ZipFile(rendered_file, 'r') as rendered, \
+            zipfile.ZipFile(delta_file, 'w', zipfile.ZIP_DEFLATED) as delta:
+        template_entries = {info.filename: info for info in template.infolist()}
+        for info in rendered.infolist():
+            template_info = template_entries.get(info.filename)
+            if template_info is not None and _same_content(template, template_info, rendered, info):
+                manifest['entries'].append({'name': info.filename, 'source': 'template'})
+            else:
+                copy_entry_raw(rendered, info, delta, name=_PART_PREFIX + info.filename)
+                manifest['entries'].append({'name': info.filename, 'source': 'delta'})
+        delta.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+
+    changed = sum(1 for entry in manifest['entries'] if entry['source'] == 'delta')
+    return {
+        'entries': len(manifest['entries']),
+        'changed_entries': changed,
+        'delta_bytes': os.path.getsize(delta_file),
+    }
+
+
+def read_manifest(delta_file: str) -> dict:
+    """Return the manifest of a delta file."""
+    with zipfile.ZipFile(delta_file, 'r') as delta:
+        manifest = json.loads(delta.read(MANIFEST_NAME))
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported delta format {manifest.get('format')!r} in '{delta_file}'")
+    return manifest
+
+
+def materialize(delta_file: str, output_file: str, template_file: Optional[str] = None,
+                verify: bool = True) -> int:
+    """Rebuild a full .pptx from a delta and the template it was made against.
+
+    Args:
+        template_file: Template to use (default: the path recorded in the delta).
+        verify: Check the template's SHA-256 against the one in the delta first.
+
+    Returns:
+        Number of entries written
+    """
+    manifest = read_manifest(delta_file)
+    template_file = template_file or manifest['template']['path']
+    if verify and template_sha256(template_file) != manifest['template']['sha256']:
+        raise ValueError(f"Template '{template_file}' does not match the one this delta was made from "
+                         f"(expected SHA-256 {manifest['template']['sha256']})")
+
+    with zipfile.ZipFile(template_file, 'r') as template, \
+            zipfile.ZipFile(delta_file, 'r') as delta, \
+            zipfile.ZipFile(output_file, 'w') as output:
+        for entry in manifest['entries']:
+            if entry['source'] == 'template':
+                copy_entry_raw(template, template.getinfo(entry['name']), output)
+            else:
+                copy_entry_raw(delta, delta.getinfo(_PART_PREFIX + entry['name']), output,
+                               name=entry['name'])
+    return len(manifest['entries'])
+
+
+def materialize_main(argv) -> int:
+    """Entry point for `pptmod materialize`."""
+    parser = argparse.ArgumentParser(
+        prog='pptmod materialize',
+        description="Rebuild a full .pptx from a delta written with --delta"
+    )
+    parser.add_argument('delta', help='Delta file')
+    parser.add_argument('-t', '--template', default=None,
+                        help='Template the delta was made from (default: the path recorded in the delta)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Output file path (default: the delta path with a .pptx extension)')
+    parser.add_argument('--no-verify', action='store_true',
+                        help="Skip checking the template's SHA-256")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.delta):
+        print(f"Error: Delta file '{args.delta}' not found", file=sys.stderr)
+        return 1
+
+    if args.output is None:
+        args.output = str(Path(args.delta).with_suffix('.pptx'))
+
+    try:
+        entries = materialize(args.delta, args.output, args.template, verify=not args.no_verify)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        print(f"Error: Could not materialize '{args.delta}': {e}", file=sys.stderr)
+        return 1
+
+    print(f"Materialized {args.delta} -> {args.output} ({entries} entries)")
+    return 0
@@ -13,7 +13,8 @@ from pathlib import Path
 from typing import Dict
 import threading
 import subprocess
-from main import modify_pptx, modify_ppt, export_to_pdf
+from pptx import Presentation
+from main import modify_pptx, modify_ppt, export_to_pdf, count_hits, iter_run_texts, resolve_providers
 
 
 class PPTModifierFrame(wx.Frame):
@@ -31,6 +32,13 @@ class PPTModifierFrame(wx.Frame):
         self.output_file = ""
         self.config_file = ""
         
+        # Template pre-loaded in the background: (path, mtime, Presentation)
+        self._warm = None
+        self._warm_lock = threading.Lock()
+        self._warm_thread = None
+        # Run texts of the selected template, for hit counts: (path, texts)
+        self.template_texts = None
+        
         # Create UI
         self.init_ui()
         
@@ -117,14 +125,23 @@ class PPTModifierFrame(wx.Frame):
         
         # Grid for replacements
         self.replacement_grid = wx.grid.Grid(self.panel)
-        self.replacement_grid.CreateGrid(5, 2)
+        self.replacement_grid.CreateGrid(5, 3)
         self.replacement_grid.SetColLabelValue(0, "Find Text")
         self.replacement_grid.SetColLabelValue(1, "Replace With")
+        self.replacement_grid.SetColLabelValue(2, "Hits")
         self.replacement_grid.SetColSize(0, 250)
         self.replacement_grid.SetColSize(1, 250)
+        self.replacement_grid.SetColSize(2, 60)
         self.replacement_grid.SetRowLabelSize(40)
         self.replacement_grid.SetMinSize((-1, 200))
         self.replacement_grid.EnableEditing(True)
+        
+        # Hits is filled in from the template, not edited
+        hits_attr = wx.grid.GridCellAttr()
+        hits_attr.SetReadOnly(True)
+        hits_attr.SetAlignment(wx.ALIGN_RIGHT, wx.ALIGN_CENTER)
+        self.replacement_grid.SetColAttr(2, hits_attr)
+        self.replacement_grid.Bind(wx.grid.EVT_GRID_CELL_CHANGED, self.on_grid_cell_changed)
         config_box.Add(self.replacement_grid, 1, wx.EXPAND | wx.ALL, 5)
         
         # Grid control buttons
@@ -230,6 +247,7 @@ class PPTModifierFrame(wx.Frame):
                     self.output_text.SetValue(auto_output)
                     if hasattr(self, 'log_text'):
                         self.log(f"Restored last template: {last_template}")
+                    self.start_prewarm(last_template)
             
             # Clear existing grid
             if self.replacement_grid.GetNumberRows() > 0:
@@ -243,9 +261,12 @@ class PPTModifierFrame(wx.Frame):
                 row = 0
                 for key, value in replacements.items():
                     self.replacement_grid.SetCellValue(row, 0, key)
-                    self.replacement_grid.SetCellValue(row, 1, value)
+                    # Provider specs are shown (and edited) as JSON
+                    self.replacement_grid.SetCellValue(row, 1, value if isinstance(value, str) else json.dumps(value))
                     row += 1
             
+            self.update_hit_counts()
+            
             if hasattr(self, 'log_text'):
                 self.log(f"Loaded {num_rows} replacement(s) from {config_path}")
             
@@ -263,6 +284,13 @@ class PPTModifierFrame(wx.Frame):
             key = self.replacement_grid.GetCellValue(row, 0).strip()
             value = self.replacement_grid.GetCellValue(row, 1).strip()
             
+            # Provider specs ({"provider": "module:function"}) are entered as JSON
+            if value.startswith('{') and '"provider"' in value:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    pass
+            
             # Only add non-empty pairs
             if key:
                 if key in replacements:
@@ -277,6 +305,33 @@ class PPTModifierFrame(wx.Frame):
         
         return replacements
     
+    def update_hit_counts(self):
+        """Show how often each Find Text key occurs in the template and flag keys that never match."""
+        grid = self.replacement_grid
+        keys = [grid.GetCellValue(row, 0).strip() for row in range(grid.GetNumberRows())]
+        
+        # Counts are only shown once the current template has been indexed
+        indexed = self.template_texts is not None and self.template_texts[0] == self.input_file
+        hits = count_hits(self.template_texts[1], keys) if indexed else {}
+        
+        default_colour = grid.GetDefaultCellBackgroundColour()
+        for row, key in enumerate(keys):
+            if key in hits:
+                grid.SetCellValue(row, 2, str(hits[key]))
+                colour = wx.Colour(255, 220, 220) if hits[key] == 0 else default_colour
+            else:
+                grid.SetCellValue(row, 2, "")
+                colour = default_colour
+            grid.SetCellBackgroundColour(row, 0, colour)
+            grid.SetCellBackgroundColour(row, 2, colour)
+        grid.ForceRefresh()
+    
+    def on_grid_cell_changed(self, event):
+        """Recount hits when a Find Text cell is edited."""
+        if event.GetCol() == 0:
+            self.update_hit_counts()
+        event.Skip()
+    
     def on_add_row(self, event):
         """Add a new row to the replacement grid."""
         self.replacement_grid.AppendRows(1)
@@ -291,6 +346,7 @@ class PPTModifierFrame(wx.Frame):
             current_row = self.replacement_grid.GetGridCursorRow()
             if current_row >= 0 and self.replacement_grid.GetNumberRows() > 0:
                 self.replacement_grid.DeleteRows(current_row, 1)
+                self.update_hit_counts()
                 self.log(f"Removed row {current_row + 1}")
             else:
                 wx.MessageBox("Please select a row to remove", "No Selection", wx.OK | wx.ICON_INFORMATION)
@@ -298,6 +354,7 @@ class PPTModifierFrame(wx.Frame):
             # Remove all selected rows (from bottom to top to maintain indices)
             for row in sorted(selected_rows, reverse=True):
                 self.replacement_grid.DeleteRows(row, 1)
+            self.update_hit_counts()
             self.log(f"Removed {len(selected_rows)} row(s)")
     
     def on_clear_all_rows(self, event):
@@ -424,6 +481,9 @@ class PPTModifierFrame(wx.Frame):
             # Auto-save last template to config
             self.save_last_template_to_config()
             
+            # Parse the template now so hit counts show up and Process is quick
+            self.start_prewarm(self.input_file)
+            
             # Auto-generate output filename if not set
             if not self.output_file:
                 input_path = Path(self.input_file)
@@ -432,6 +492,62 @@ class PPTModifierFrame(wx.Frame):
         
         dialog.Destroy()
     
+    def start_prewarm(self, input_file: str):
+        """Load and index a .pptx template in the background so Process can reuse it."""
+        self.update_hit_counts()
+        
+        # .ppt files are edited through PowerPoint itself, so there is nothing to pre-load
+        if input_file != self.input_file or Path(input_file).suffix.lower() != '.pptx':
+            return
+        
+        thread = threading.Thread(target=self.prewarm_thread, args=(input_file,))
+        thread.daemon = True
+        self._warm_thread = thread
+        thread.start()
+    
+    def prewarm_thread(self, input_file: str):
+        """Parse the template and collect its run texts (runs in separate thread)."""
+        try:
+            mtime = os.path.getmtime(input_file)
+            prs = Presentation(input_file)
+            texts = list(iter_run_texts(prs))
+        except Exception as e:
+            wx.CallAfter(self.log, f"Could not pre-load template: {str(e)}")
+            return
+        
+        with self._warm_lock:
+            # A different template may have been picked in the meantime
+            if input_file != self.input_file:
+                return
+            self._warm = (input_file, mtime, prs)
+        wx.CallAfter(self.on_prewarm_done, input_file, texts)
+    
+    def on_prewarm_done(self, input_file: str, texts):
+        """Show hit counts for a template that finished indexing."""
+        if input_file == self.input_file:
+            self.template_texts = (input_file, texts)
+            self.update_hit_counts()
+    
+    def take_warm_presentation(self, input_file: str):
+        """Return the pre-loaded Presentation of input_file, or None if there isn't a usable one.
+        
+        Waits for a pre-load that is still running. The Presentation is handed over
+        to the caller, since rendering modifies it.
+        """
+        thread = self._warm_thread
+        if thread is not None:
+            thread.join()
+        
+        with self._warm_lock:
+            warm, self._warm = self._warm, None
+        
+        if warm is None:
+            return None
+        path, mtime, prs = warm
+        if path != input_file or os.path.getmtime(input_file) != mtime:
+            return None
+        return prs
+    
     def save_last_template_to_config(self):
         """Save the last opened template to the config file."""
         if not self.config_file or not os.path.exists(self.config_file):
@@ -549,6 +665,7 @@ class PPTModifierFrame(wx.Frame):
         """Process the PowerPoint file (runs in separate thread)."""
         try:
             wx.CallAfter(self.log, f"Using {len(replacements)} replacement(s)")
+            replacements = resolve_providers(replacements)
             
             # Determine file type
             file_ext = Path(input_file).suffix.lower()
@@ -558,7 +675,11 @@ class PPTModifierFrame(wx.Frame):
             
             replacement_count = 0
             if file_ext == '.pptx':
-                replacement_count = modify_pptx(input_file, output_file, replacements)
+                presentation = self.take_warm_presentation(input_file)
+                if presentation is not None:
+                    wx.CallAfter(self.log, "Using pre-loaded template")
+                replacement_count = modify_pptx(input_file, output_file, replacements,
+                                                presentation=presentation)
             elif file_ext == '.ppt':
                 replacement_count = modify_ppt(input_file, output_file, replacements)
             else:
@@ -577,6 +698,9 @@ class PPTModifierFrame(wx.Frame):
         
         finally:
             wx.CallAfter(self.process_btn.Enable, True)
+            # The pre-loaded template was used up; load a fresh one for the next run
+            if Path(input_file).suffix.lower() == '.pptx':
+                wx.CallAfter(self.start_prewarm, input_file)
     
     def show_success(self, output_file):
         """Show success dialog."""
@@ -678,6 +802,7 @@ class PPTModifierFrame(wx.Frame):
                 return
             
             wx.CallAfter(self.log, f"Using {len(replacements)} replacement(s)")
+            replacements = resolve_providers(replacements)
             
             # Determine file type
             file_ext = Path(input_file).suffix.lower()
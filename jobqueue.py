@@ -0,0 +1,362 @@
+"""
+PowerPoint Text Modifier job queue
+A resumable batch queue kept in a local SQLite file. Each job records whether it is
+pending, running, done or failed, plus a hash of its output. Any number of
+`pptmod worker` processes can share the file (on one machine, or several machines
+sharing the filesystem). Workers claim jobs with time-limited leases and retry
+failures with exponential backoff.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from main import render, resolve_providers
+from pptzip import file_sha256
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    template TEXT NOT NULL,
+    output TEXT NOT NULL UNIQUE,
+    replacements TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    output_hash TEXT,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, not_before);
+"""
+
+
+class JobQueue:
+    """A job queue stored in a SQLite file.
+
+    Claims run inside an immediate (write-locking) transaction, so two workers
+    never get the same job. A running job whose lease has expired, for example
+    because its worker crashed, becomes claimable again, unless it has already
+    used max_attempts attempts, in which case it is marked failed.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 600, max_attempts: int = 3,
+                 backoff_seconds: float = 30):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        # Rollback journal rather than WAL: WAL needs shared memory, which
+        # does not work for workers on different machines sharing the file.
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def add(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """Add jobs to the queue, skipping any whose output is already queued.
+
+        Each job is a dict with 'template', 'output', 'replacements' and optional
+        'options' (keyword options for render()).
+
+        Returns:
+            Number of jobs added
+        """
+        now = time.time()
+        rows = (
+            (job['template'], job['output'], json.dumps(job['replacements']),
+             json.dumps(job.get('options', {})), now)
+            for job in jobs
+        )
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO jobs (template, output, replacements, options, updated) '
+                'VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            return self.conn.total_changes - before
+
+    def claim(self, worker: str, shard: Optional[Tuple[int, int]] = None) -> Optional[sqlite3.Row]:
+        """Lease the next runnable job to a worker.
+
+        Args:
+            shard: (index, count) to only claim jobs whose id % count == index.
+
+        Returns:
+            The claimed job row, or None if nothing is runnable right now
+        """
+        now = time.time()
+        query = (
+            'SELECT * FROM jobs WHERE '
+            '((status = ? AND not_before <= ?) OR (status = ? AND lease_expires < ?))'
+        )
+        params = [PENDING, now, RUNNING, now]
+        if shard is not None:
+            query += ' AND id % ? = ?'
+            params += [shard[1], shard[0]]
+        query += ' ORDER BY id LIMIT 1'
+
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            # A job that keeps outliving its lease (e.g. crashing its worker) must not be retried forever
+            self.conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated = ? '
+                'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (FAILED, 'Lease expired on the last attempt', now, RUNNING, now, self.max_attempts)
+            )
+            job = self.conn.execute(query, params).fetchone()
+            if job is None:
+                return None
+            self.conn.execute(
+                'UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, '
+                'attempts = attempts + 1, updated = ? WHERE id = ?',
+                (RUNNING, worker, now + self.lease_seconds, now, job['id'])
+            )
+        return job
+
+    def renew(self, job_id: int, worker: str) -> bool:
+        """Extend a running job's lease. Returns False if the worker no longer holds it."""
+        with self.conn:
+            cursor = self.conn.execute(
+                'UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = ?',
+                (time.time() + self.lease_seconds, job_id, worker, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, output_hash: str) -> bool:
+        """Mark a job done. Returns False if the worker no longer holds its lease."""
+        with self.conn:
+            cursor = self.conn.execute(
+                'UPDATE jobs SET status = ?, output_hash = ?, error = NULL, '
+                'lease_expires = NULL, updated = ? WHERE id = ? AND worker = ? AND status = ?',
+                (DONE, output_hash, time.time(), job_id, worker, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Record a failed attempt, scheduling a retry with exponential backoff.
+
+        The job is marked failed once it has used max_attempts attempts.
+        Returns False if the worker no longer holds its lease.
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            job = self.conn.execute(
+                'SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?',
+                (job_id, worker, RUNNING)
+            ).fetchone()
+            if job is None:
+                return False
+            if job['attempts'] >= self.max_attempts:
+                status, not_before = FAILED, 0
+            else:
+                status = PENDING
+                not_before = now + self.backoff_seconds * 2 ** (job['attempts'] - 1)
+            self.conn.execute(
+                'UPDATE jobs SET status = ?, not_before = ?, error = ?, '
+                'lease_expires = NULL, updated = ? WHERE id = ?',
+                (status, not_before, error, now, job_id)
+            )
+        return True
+
+    def retry_failed(self) -> int:
+        """Put failed jobs back in the queue with a fresh attempt count."""
+        with self.conn:
+            cursor = self.conn.execute(
+                'UPDATE jobs SET status = ?, attempts = 0, not_before = 0, updated = ? '
+                'WHERE status = ?',
+                (PENDING, time.time(), FAILED)
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for row in self.conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+            counts[row[0]] = row[1]
+        return counts
+
+    def has_unfinished(self, shard: Optional[Tuple[int, int]] = None) -> bool:
+        """True if any job (in the shard) is still pending or running."""
+        query = 'SELECT 1 FROM jobs WHERE status IN (?, ?)'
+        params = [PENDING, RUNNING]
+        if shard is not None:
+            query += ' AND id % ? = ?'
+            params += [shard[1], shard[0]]
+        return self.conn.execute(query + ' LIMIT 1', params).fetchone() is not None
+
+
+@contextmanager
+def lease_heartbeat(queue: JobQueue, job_id: int, worker: str):
+    """Keep renewing a job's lease from a background thread while the block runs.
+
+    The lease is renewed every third of its length, so a render may take longer
+    than the lease as long as its worker is alive. The thread uses its own
+    connection, as SQLite connections can't be shared between threads.
+    """
+    stop = threading.Event()
+
+    def renew_leases():
+        heartbeat_queue = JobQueue(queue.path, lease_seconds=queue.lease_seconds)
+        try:
+            while not stop.wait(queue.lease_seconds / 3):
+                if not heartbeat_queue.renew(job_id, worker):
+                    return
+        finally:
+            heartbeat_queue.close()
+
+    thread = threading.Thread(target=renew_leases, name=f'lease-{job_id}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(queue: JobQueue, worker: str, shard: Optional[Tuple[int, int]] = None,
+               poll_interval: float = 5, allowed_providers: Iterable[str] = ()) -> int:
+    """Claim and render jobs until no job in the shard is pending or running.
+
+    Replacement providers in job data are only loaded from allowed_providers
+    (see main.load_provider).
+
+    Returns:
+        Number of jobs this worker completed
+    """
+    completed = 0
+    while True:
+        job = queue.claim(worker, shard)
+        if job is None:
+            if not queue.has_unfinished(shard):
+                return completed
+            # Waiting on backoff or another worker's lease
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            with lease_heartbeat(queue, job['id'], worker):
+                replacements = resolve_providers(json.loads(job['replacements']), allowed_providers)
+                render(job['template'], job['output'], replacements, **json.loads(job['options']))
+                output_hash = file_sha256(job['output'])
+        except Exception as e:
+            queue.fail(job['id'], worker, str(e))
+            print(f"Job {job['id']} failed (attempt {job['attempts'] + 1}): {e}", file=sys.stderr)
+            continue
+
+        if queue.complete(job['id'], worker, output_hash):
+            completed += 1
+        else:
+            print(f"Job {job['id']} lease expired before it finished", file=sys.stderr)
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a shard spec like '2/8' into (index, count)."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}', expected INDEX/COUNT")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}', INDEX must be below COUNT")
+    return index, count
+
+
+def read_jobs(jobs_path: str):
+    """Yield jobs from a JSON-lines file, one job object per line."""
+    with open(jobs_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Error: Invalid JSON on line {line_number} of {jobs_path}: {e}", file=sys.stderr)
+                sys.exit(1)
+
+
+def queue_main(argv) -> int:
+    """Entry point for `pptmod queue`."""
+    parser = argparse.ArgumentParser(prog='pptmod queue', description="Manage a batch job queue")
+    parser.add_argument('--db', help='Queue database file (default: pptmodqueue.db)',
+                        default='pptmodqueue.db')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = commands.add_parser('add', help='Add jobs from a JSON-lines file')
+    add_parser.add_argument('jobs', help='File with one {"template", "output", "replacements"} object per line')
+    commands.add_parser('status', help='Show job counts by status')
+    commands.add_parser('retry', help='Requeue failed jobs')
+
+    args = parser.parse_args(argv)
+    queue = JobQueue(args.db)
+    try:
+        if args.command == 'add':
+            added = queue.add(read_jobs(args.jobs))
+            print(f"Added {added} job(s) to {args.db}")
+        elif args.command == 'retry':
+            print(f"Requeued {queue.retry_failed()} failed job(s)")
+        else:
+            for status, count in queue.counts().items():
+                print(f"{status}: {count}")
+    finally:
+        queue.close()
+    return 0
+
+
+def worker_main(argv) -> int:
+    """Entry point for `pptmod worker`."""
+    parser = argparse.ArgumentParser(prog='pptmod worker', description="Render jobs from a batch job queue")
+    parser.add_argument('--db', help='Queue database file (default: pptmodqueue.db)',
+                        default='pptmodqueue.db')
+    parser.add_argument('--shard', type=parse_shard, default=None,
+                        help="Only claim jobs from one shard, e.g. '0/4'")
+    parser.add_argument('--lease', type=float, default=600,
+                        help='Seconds a claimed job is reserved before other workers may retake it (default: 600)')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='Attempts before a job is marked failed (default: 3)')
+    parser.add_argument('--backoff', type=float, default=30,
+                        help='Delay before the first retry, doubled on each further retry (default: 30)')
+    parser.add_argument('--poll', type=float, default=5,
+                        help='Seconds to wait when no job is runnable yet (default: 5)')
+    parser.add_argument('--allow-provider', action='append', default=[], metavar='MODULE',
+                        help='Module or module:function that jobs may use as a replacement provider (repeatable)')
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"Error: Queue database '{args.db}' not found", file=sys.stderr)
+        return 1
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue(args.db, lease_seconds=args.lease, max_attempts=args.max_attempts,
+                     backoff_seconds=args.backoff)
+    try:
+        completed = run_worker(queue, worker, shard=args.shard, poll_interval=args.poll,
+                               allowed_providers=args.allow_provider)
+        counts = queue.counts()
+    finally:
+        queue.close()
+
+    print(f"Worker {worker} completed {completed} job(s)")
+    print(f"Queue: {counts[DONE]} done, {counts[FAILED]} failed")
+    return 1 if counts[FAILED] else 0
@@ -5,18 +5,80 @@ Modifies text in PowerPoint presentations (.ppt and .pptx) based on a config fil
 """
 
 import argparse
+import functools
+import hashlib
+import importlib
+import io
 import json
 import sys
 from pathlib import Path
 import comtypes.client
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from lxml import etree
 from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
 import win32com.client
 import os
+import re
+import zipfile
+from pptzip import CHUNK_SIZE, rewrite_package
 
 
-def load_config(config_path: str) -> Dict[str, str]:
-    """Load text replacements from a JSON config file."""
+SUPPORTED_EXTENSIONS = ('.ppt', '.pptx')
+
+# DrawingML text run elements, as found in slide XML
+_A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_RUN_TEXT_PATH = f'.//{{{_A_NS}}}r/{{{_A_NS}}}t'
+
+# Part types whose text can be replaced, by content type
+PART_TYPES = {
+    'slides': (CT.PML_SLIDE,),
+    'layouts': (CT.PML_SLIDE_LAYOUT,),
+    'masters': (CT.PML_SLIDE_MASTER, CT.PML_NOTES_MASTER, CT.PML_HANDOUT_MASTER),
+    'notes': (CT.PML_NOTES_SLIDE,),
+    # SmartArt: the text model and the cached drawing PowerPoint displays
+    'diagrams': (CT.DML_DIAGRAM_DATA, CT.DML_DIAGRAM_DRAWING),
+}
+DEFAULT_PARTS = ('slides',)
+
+
+def load_provider(spec: Dict[str, Any], allowed: Optional[Iterable[str]] = None):
+    """Turn a {"provider": "module:function", "args": [...], "kwargs": {...}} value into a callable.
+    
+    The function is imported now but only called if its placeholder is found.
+    
+    Args:
+        allowed: Module names or 'module:function' names that may be used. Job
+            data from --stdio or a queue passes the --allow-provider list here, so
+            a job can't import and call any function it likes. None allows every
+            provider, as for a config file.
+    """
+    module_name, separator, function_name = spec['provider'].partition(':')
+    if not separator or not module_name or not function_name:
+        raise ValueError(f"Invalid provider '{spec['provider']}', expected 'module:function'")
+    if allowed is not None and module_name not in allowed and spec['provider'] not in allowed:
+        raise ValueError(f"Provider '{spec['provider']}' is not allowed (allow it with --allow-provider)")
+    function = getattr(importlib.import_module(module_name), function_name)
+    return functools.partial(function, *spec.get('args', []), **spec.get('kwargs', {}))
+
+
+def resolve_providers(replacements: Dict[str, Any],
+                      allowed: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Replace provider specs among the values of replacements with callables (see load_provider)."""
+    if allowed is not None:
+        allowed = set(allowed)
+    return {
+        key: load_provider(value, allowed) if isinstance(value, dict) and 'provider' in value else value
+        for key, value in replacements.items()
+    }
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load text replacements from a JSON config file.
+    
+    A value may be a provider spec, {"provider": "module:function"}, which is
+    loaded as a callable computed only if its placeholder is used.
+    """
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
@@ -25,50 +87,422 @@ def load_config(config_path: str) -> Dict[str, str]:
             print("Error: Config file must contain 'replacements' key", file=sys.stderr)
             sys.exit(1)
         
-        return config['replacements']
+        return resolve_providers(config['replacements'])
     except FileNotFoundError:
         print(f"Error: Config file '{config_path}' not found", file=sys.stderr)
         sys.exit(1)
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in config file: {e}", file=sys.stderr)
         sys.exit(1)
+    except (ImportError, AttributeError, ValueError) as e:
+        print(f"Error: Could not load a replacement provider: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# Shared results of callable replacement values: id(callable) -> (callable, text)
+ValueCache = Dict[int, Tuple[Any, str]]
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_keys(keys: Tuple[str, ...]):
+    """Compile a regex matching any of the keys."""
+    return re.compile('|'.join(re.escape(key) for key in keys))
+
+
+class Replacer:
+    """Applies a set of text replacements to runs of text.
+    
+    Keys are applied one after another in dict order with str.replace, so a
+    later key also matches text inserted by an earlier one. Most runs hold no
+    key at all; a regex of all the keys, compiled once per key set and cached,
+    finds those in a single scan so they skip the per-key loop. Batches that
+    reuse the same placeholders only compile it once.
+    
+    A value may be a callable taking no arguments (a function, functools.partial
+    or provider object). It is only called when its key is first found, and the
+    result is reused for the rest of the render. Pass the same dict as cache to
+    several Replacers to also share results between them, e.g. across the rows of
+    a merge or the jobs of a batch. The shared cache is keyed by id() of the
+    callable and keeps a reference to it, so callables need not be hashable.
+    """
+    
+    def __init__(self, replacements: Dict[str, Any], cache: Optional[ValueCache] = None):
+        self.replacements = replacements
+        self.cache = cache
+        self.keys = tuple(key for key in replacements if key)
+        self._pattern = _compile_keys(self.keys) if self.keys else None
+        # Computed values of this Replacer, by placeholder
+        self._values = {}
+    
+    def value(self, key: str) -> str:
+        """Return the replacement text for key, computing it if it is a callable."""
+        value = self.replacements[key]
+        if not callable(value):
+            return value
+        if key in self._values:
+            return self._values[key]
+        
+        cached = self.cache.get(id(value)) if self.cache is not None else None
+        # Holding the callable keeps its id from being reused by another object
+        if cached is not None and cached[0] is value:
+            result = cached[1]
+        else:
+            result = str(value())
+            if self.cache is not None:
+                self.cache[id(value)] = (value, result)
+        self._values[key] = result
+        return result
+    
+    def replace(self, text: str) -> Tuple[str, int]:
+        """Apply the replacements to a run of text.
+        
+        Returns:
+            The new text and the number of keys that matched
+        """
+        if self._pattern is None or not self._pattern.search(text):
+            return text, 0
+        
+        count = 0
+        for key in self.keys:
+            if key in text:
+                text = text.replace(key, self.value(key))
+                count += 1
+        return text, count
+
+
+def as_replacer(replacements, cache: Optional[ValueCache] = None) -> Replacer:
+    """Return replacements as a Replacer, compiling a dict if needed."""
+    if isinstance(replacements, Replacer):
+        return replacements
+    return Replacer(replacements, cache=cache)
+
+
+_CTRL_CHARS = re.compile(r'[\x00-\x08\x0B-\x1F]')
+
+
+def escape_ctrl_chars(text: str) -> str:
+    """Escape the control characters XML can't hold (e.g. _x000B_ for a vertical tab).
+    
+    This is what python-pptx does when setting run text; PowerPoint shows the
+    escapes as the original characters. Tab and line feed are left as they are.
+    """
+    return _CTRL_CHARS.sub(lambda match: '_x%04X_' % ord(match.group(0)), text)
+
+
+def replace_in_xml(root, replacer: Replacer) -> int:
+    """Apply replacements to every text run (a:r/a:t) under an lxml element.
+    
+    Returns:
+        Number of text replacements made
+    """
+    count = 0
+    for text_element in root.iterfind(_RUN_TEXT_PATH):
+        text, matched = replacer.replace(text_element.text or '')
+        if matched:
+            text_element.text = escape_ctrl_chars(text)
+            count += matched
+    return count
+
+
+def count_hits(texts: List[str], keys: List[str]) -> Dict[str, int]:
+    """Count how many times each key occurs in texts.
+    
+    Returns:
+        Key -> number of occurrences, for every non-empty key
+    """
+    # Runs never contain NUL, so occurrences cannot span two runs
+    text = '\0'.join(texts)
+    return {key: text.count(key) for key in keys if key}
 
 
-def modify_pptx(input_file: str, output_file: str, replacements: Dict[str, str]) -> int:
+def _check_part_types(parts) -> None:
+    """Raise ValueError for names that are not in PART_TYPES."""
+    unknown = [name for name in parts if name not in PART_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown part type(s) {', '.join(unknown)} (choose from {', '.join(PART_TYPES)})")
+
+
+def parse_parts(parts) -> Tuple[str, ...]:
+    """Turn a parts value into a tuple of PART_TYPES names.
+
+    Accepts a sequence of names, or a string: a comma-separated list such as
+    'slides,notes', or 'all'. Raises ValueError for unknown names or an empty list.
+    """
+    if isinstance(parts, str):
+        if parts.strip() == 'all':
+            return tuple(PART_TYPES)
+        parts = [name.strip() for name in parts.split(',') if name.strip()]
+    parts = tuple(parts)
+    if not parts:
+        raise ValueError("No part types given")
+    _check_part_types(parts)
+    return parts
+
+
+def iter_shapes(shapes):
+    """Yield every shape in a shape collection, descending into group shapes."""
+    for shape in shapes:
+        yield shape
+        if hasattr(shape, 'shapes'):
+            yield from iter_shapes(shape.shapes)
+
+
+def iter_text_parts(prs, parts=DEFAULT_PARTS, slides=None):
+    """Yield (part, root element) for each package part of the given types, once each.
+    
+    SmartArt parts are kept by python-pptx as bytes, so they are parsed here;
+    after editing one, write it back with _store_part_xml().
+    
+    Args:
+        parts: Names from PART_TYPES.
+        slides: Only these slides among the slide parts, and only their notes
+            among the notes parts (default: every slide).
+    """
+    _check_part_types(parts)
+    content_types = {content_type for name in parts for content_type in PART_TYPES[name]}
+    slide_parts = notes_parts = None
+    if slides is not None:
+        slide_parts = {slide.part for slide in slides}
+        notes_parts = {rel.target_part for part in slide_parts for rel in part.rels.values()
+                       if rel.reltype == RT.NOTES_SLIDE}
+    
+    for part in prs.part.package.iter_parts():
+        if part.content_type not in content_types:
+            continue
+        if slide_parts is not None and part.content_type == CT.PML_SLIDE and part not in slide_parts:
+            continue
+        if notes_parts is not None and part.content_type == CT.PML_NOTES_SLIDE and part not in notes_parts:
+            continue
+        root = part._element if hasattr(part, '_element') else etree.fromstring(part.blob)
+        yield part, root
+
+
+def _store_part_xml(part, root) -> None:
+    """Write an edited root element back to a part python-pptx keeps as bytes."""
+    if not hasattr(part, '_element'):
+        part._blob = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def iter_run_texts(prs, parts=DEFAULT_PARTS, slides=None):
+    """Yield the text of every run that replace_in_presentation would edit."""
+    for part, root in iter_text_parts(prs, parts, slides):
+        for text_element in root.iterfind(_RUN_TEXT_PATH):
+            yield text_element.text or ''
+
+
+def replace_in_presentation(prs, replacements: Dict[str, str], slides=None,
+                            parts=DEFAULT_PARTS) -> int:
+    """Apply replacements to a loaded python-pptx Presentation in one pass over its parts.
+    
+    Every text run in each selected part is visited exactly once, including runs
+    in group shapes, tables and placeholders.
+    
+    Args:
+        slides: Slides to process (default: every slide in prs).
+        parts: Part types to process, from PART_TYPES (default: slides only).
+    
+    Returns:
+        Number of text replacements made
+    """
+    replacer = as_replacer(replacements)
+    replacement_count = 0
+    for part, root in iter_text_parts(prs, parts, slides):
+        count = replace_in_xml(root, replacer)
+        if count:
+            _store_part_xml(part, root)
+            replacement_count += count
+    return replacement_count
+
+
+def _retarget_relationship(rel, target_part) -> None:
+    """Point an existing python-pptx relationship at a different part."""
+    rel._target = target_part
+    # python-pptx caches the resolved target on first access
+    for cached in ('target_part', 'target_partname', 'target_ref'):
+        rel.__dict__.pop(cached, None)
+
+
+def dedupe_media(prs) -> int:
+    """Collapse byte-identical media parts (ppt/media/*) onto a single part.
+    
+    Relationships pointing at a duplicate are retargeted to the first copy. The
+    duplicates are then unreachable, so they are not written when the presentation
+    is saved.
+    
+    Returns:
+        Number of bytes saved
+    """
+    parts = list(prs.part.package.iter_parts())
+    
+    # Hash every media part, keeping the first part seen for each blob
+    canonical = {}
+    duplicates = {}
+    for part in parts:
+        if not str(part.partname).startswith('/ppt/media/'):
+            continue
+        key = (part.content_type, hashlib.sha256(part.blob).digest())
+        first = canonical.setdefault(key, part)
+        if first is not part:
+            duplicates[part.partname] = first
+    
+    if not duplicates:
+        return 0
+    
+    # Retarget relationships from every part onto the surviving copy
+    for part in parts:
+        for rel in part.rels.values():
+            if rel.is_external:
+                continue
+            target = duplicates.get(rel.target_part.partname)
+            if target is not None:
+                _retarget_relationship(rel, target)
+    
+    return sum(len(part.blob) for part in parts if part.partname in duplicates)
+
+
+def modify_pptx(input_file: str, output_file: str, replacements: Dict[str, str],
+                optimize_media: bool = False, rows: Optional[List[Dict[str, str]]] = None,
+                repeat_slide: Optional[int] = None,
+                tables: Optional[Dict[str, Any]] = None,
+                charts: Optional[Dict[str, Dict[str, Any]]] = None,
+                chart_workbooks: bool = True, presentation=None,
+                slides=None, delta: bool = False,
+                value_cache: Optional[ValueCache] = None,
+                parts=DEFAULT_PARTS) -> int:
     """Modify a .pptx file using python-pptx library.
     
+    Args:
+        optimize_media: Deduplicate identical media parts before saving.
+        rows: Data rows; the repeat slide is cloned once per row, with the row's
+            values applied on top of replacements (see repeat.render_repeated).
+        repeat_slide: 1-based number of the slide to repeat for rows (default:
+            the slide containing the {{repeat}} marker).
+        tables: Table shape name -> CSV path, list of rows or dict of columns;
+            each table is filled after the text replacements (see tables.bind_tables).
+        charts: Chart shape name -> {"categories": [...], "series": {...}}; the
+            chart data is replaced in place (see charts.bind_charts).
+        chart_workbooks: Also update the workbooks embedded in the charts. Turn
+            off to only update the displayed values, which is much faster.
+        presentation: input_file already loaded with python-pptx, to skip parsing
+            it again. It is modified in place, so it can only be used once.
+        slides: Only render these slides: 1-based numbers, or a selection such as
+            '3-7', '1,4,9-12' or a section name (see subset.extract_slides). The
+            other slides, and parts only they use, are never loaded. Slide numbers
+            in repeat_slide then count within the selection.
+        delta: Write output_file as a delta holding only the parts that differ
+            from input_file (see delta.write_delta); `pptmod materialize`
+            rebuilds the full deck from it.
+        value_cache: Dict for the results of callable replacement values (see
+            Replacer). Pass the same dict to several renders to compute each
+            value once for the whole batch.
+        parts: Part types to replace text in, from PART_TYPES: slides, layouts,
+            masters, notes and diagrams (SmartArt). Default: slides only.
+    
     Returns:
         Number of text replacements made
     """
     try:
-        prs = Presentation(input_file)
-        replacement_count = 0
+        if slides is not None:
+            from subset import extract_slides
+            prs = Presentation(extract_slides(input_file, slides))
+            print(f"Selected {len(prs.slides)} slide(s)")
+        elif presentation is not None:
+            prs = presentation
+        else:
+            prs = Presentation(input_file)
+        if rows is not None:
+            from repeat import render_repeated
+            replacement_count = render_repeated(prs, rows, replacements, slide_number=repeat_slide,
+                                                value_cache=value_cache, parts=parts)
+            print(f"Repeated slide for {len(rows)} row(s)")
+        else:
+            replacement_count = replace_in_presentation(prs, as_replacer(replacements, cache=value_cache),
+                                                        parts=parts)
         
-        # Iterate through all slides
-        for slide in prs.slides:
-            # Check all shapes in the slide
-            for shape in slide.shapes:
-                if hasattr(shape, "text_frame"):
-                    # Iterate through paragraphs and runs
-                    for paragraph in shape.text_frame.paragraphs:
-                        for run in paragraph.runs:
-                            for old_text, new_text in replacements.items():
-                                if old_text in run.text:
-                                    run.text = run.text.replace(old_text, new_text)
-                                    replacement_count += 1
-                
-                # Handle tables
-                if shape.has_table:
-                    for row in shape.table.rows:
-                        for cell in row.cells:
-                            for paragraph in cell.text_frame.paragraphs:
-                                for run in paragraph.runs:
-                                    for old_text, new_text in replacements.items():
-                                        if old_text in run.text:
-                                            run.text = run.text.replace(old_text, new_text)
-                                            replacement_count += 1
-        
-        prs.save(output_file)
+        if tables:
+            from tables import bind_tables
+            cells_written = bind_tables(prs, tables)
+            print(f"Filled {len(tables)} table(s), {cells_written} cell(s)")
+        
+        if charts:
+            from charts import bind_charts
+            chart_count = bind_charts(prs, charts, update_workbooks=chart_workbooks)
+            print(f"Updated {chart_count} chart(s)")
+        
+        if optimize_media:
+            saved_bytes = dedupe_media(prs)
+            print(f"Deduplicated media, saved {saved_bytes} bytes")
+        
+        if delta:
+            from delta import write_delta
+            rendered = io.BytesIO()
+            prs.save(rendered)
+            stats = write_delta(input_file, rendered, output_file)
+            print(f"Wrote delta with {stats['changed_entries']} of {stats['entries']} parts "
+                  f"({stats['delta_bytes']} bytes)")
+        else:
+            prs.save(output_file)
+        print(f"Successfully modified {input_file} -> {output_file}")
+        print(f"Made {replacement_count} text replacements")
+        return replacement_count
+    
+    except Exception as e:
+        print(f"Error modifying .pptx file: {e}", file=sys.stderr)
+        raise
+
+
+def _package_entries_of_types(input_file: str, parts) -> set:
+    """Return the zip entry names of a package's parts of the given PART_TYPES."""
+    content_types = {content_type for name in parts for content_type in PART_TYPES[name]}
+    ct_ns = '{http://schemas.openxmlformats.org/package/2006/content-types}'
+    
+    with zipfile.ZipFile(input_file, 'r') as package:
+        types = etree.fromstring(package.read('[Content_Types].xml'))
+        names = package.namelist()
+    defaults = {default.get('Extension', '').lower(): default.get('ContentType')
+                for default in types.iter(f'{ct_ns}Default')}
+    overrides = {override.get('PartName', '').lstrip('/'): override.get('ContentType')
+                 for override in types.iter(f'{ct_ns}Override')}
+    
+    return {
+        name for name in names
+        if overrides.get(name, defaults.get(name.rpartition('.')[2].lower())) in content_types
+    }
+
+
+def modify_pptx_streaming(input_file: str, output_file: str, replacements: Dict[str, str],
+                          chunk_size: int = CHUNK_SIZE, parts=DEFAULT_PARTS) -> int:
+    """Modify a .pptx file with bounded memory use.
+    
+    Only the XML parts of the selected types are inflated and edited; every
+    other entry (images, video, embedded files) is streamed from input to output
+    in chunks of chunk_size bytes, so peak memory does not grow with the size of
+    the media. Text in group shapes is reached as well, since runs are matched
+    in the XML.
+    
+    Args:
+        parts: Part types to edit, from PART_TYPES (default: slides only).
+    
+    Returns:
+        Number of text replacements made
+    """
+    _check_part_types(parts)
+    replacer = as_replacer(replacements)
+    replacement_count = 0
+    
+    def edit_part(name: str, data: bytes) -> bytes:
+        nonlocal replacement_count
+        root = etree.fromstring(data)
+        count = replace_in_xml(root, replacer)
+        if not count:
+            return data
+        replacement_count += count
+        return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+    
+    try:
+        selected = _package_entries_of_types(input_file, parts)
+        rewrite_package(input_file, output_file, selected.__contains__, edit_part,
+                        chunk_size=chunk_size)
         print(f"Successfully modified {input_file} -> {output_file}")
         print(f"Made {replacement_count} text replacements")
         return replacement_count
@@ -124,6 +558,7 @@ def modify_ppt(input_file: str, output_file: str, replacements: Dict[str, str])
         
         # Open the presentation
         presentation = powerpoint.Presentations.Open(input_path, WithWindow=False)
+        replacer = as_replacer(replacements)
         replacement_count = 0
         
         # Iterate through slides
@@ -134,10 +569,11 @@ def modify_ppt(input_file: str, output_file: str, replacements: Dict[str, str])
                 if shape.HasTextFrame:
                     text_frame = shape.TextFrame
                     if text_frame.HasText:
-                        for old_text, new_text in replacements.items():
-                            if old_text in text_frame.TextRange.Text:
-                                text_frame.TextRange.Text = text_frame.TextRange.Text.replace(old_text, new_text)
-                                replacement_count += 1
+                        # Read and write the text once; each access is a COM call
+                        text, count = replacer.replace(text_frame.TextRange.Text)
+                        if count:
+                            text_frame.TextRange.Text = text
+                            replacement_count += count
                 
                 # Handle tables
                 if shape.HasTable:
@@ -146,10 +582,10 @@ def modify_ppt(input_file: str, output_file: str, replacements: Dict[str, str])
                         for col in range(1, table.Columns.Count + 1):
                             cell = table.Cell(row, col)
                             if cell.Shape.HasTextFrame and cell.Shape.TextFrame.HasText:
-                                for old_text, new_text in replacements.items():
-                                    if old_text in cell.Shape.TextFrame.TextRange.Text:
-                                        cell.Shape.TextFrame.TextRange.Text = cell.Shape.TextFrame.TextRange.Text.replace(old_text, new_text)
-                                        replacement_count += 1
+                                text, count = replacer.replace(cell.Shape.TextFrame.TextRange.Text)
+                                if count:
+                                    cell.Shape.TextFrame.TextRange.Text = text
+                                    replacement_count += count
         
         # Save and close
         presentation.SaveAs(output_path)
@@ -166,12 +602,63 @@ def modify_ppt(input_file: str, output_file: str, replacements: Dict[str, str])
         raise
 
 
+def render(input_file: str, output_file: str, replacements: Dict[str, str], **options) -> int:
+    """Modify a .ppt or .pptx file, choosing the engine from its extension.
+    
+    Keyword options are passed to modify_pptx and ignored for .ppt files.
+    Pass low_memory=True to use modify_pptx_streaming instead, which only takes
+    the parts option.
+    
+    Returns:
+        Number of text replacements made
+    """
+    file_ext = Path(input_file).suffix.lower()
+    low_memory = options.pop('low_memory', False)
+    
+    if file_ext == '.pptx' and low_memory:
+        return modify_pptx_streaming(input_file, output_file, replacements,
+                                     parts=options.get('parts', DEFAULT_PARTS))
+    elif file_ext == '.pptx':
+        return modify_pptx(input_file, output_file, replacements, **options)
+    elif file_ext == '.ppt':
+        return modify_ppt(input_file, output_file, replacements)
+    else:
+        raise ValueError(f"Unsupported file type '{file_ext}'. Only .ppt and .pptx are supported")
+
+
+# Subcommands implemented in other modules
+COMMANDS = ('queue', 'worker', 'optimize-template', 'materialize')
+
+
+def _command_entry_point(name: str):
+    """Return the entry point of a subcommand.
+
+    The imports are written out so that PyInstaller sees them and bundles the
+    modules, while plain renders still don't pay for importing them.
+    """
+    if name in ('queue', 'worker'):
+        from jobqueue import queue_main, worker_main
+        return queue_main if name == 'queue' else worker_main
+    if name == 'optimize-template':
+        from optimize import optimize_main
+        return optimize_main
+    from delta import materialize_main
+    return materialize_main
+
+
 def main():
+    # Dispatch subcommands before parsing, so 'pptmod input.pptx' keeps working
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        command = _command_entry_point(sys.argv[1])
+        sys.exit(command(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
-        description="Modify text in PowerPoint presentations (.ppt and .pptx) based on a config file"
+        description="Modify text in PowerPoint presentations (.ppt and .pptx) based on a config file",
+        epilog="Other commands: " + ", ".join(f"pptmod {name}" for name in COMMANDS)
     )
     parser.add_argument(
         'input',
+        nargs='?',
         help='Input PowerPoint file (.ppt or .pptx)'
     )
     parser.add_argument(
@@ -184,9 +671,88 @@ def main():
         help='Config file with text replacements (default: pptmodconfig.json)',
         default='pptmodconfig.json'
     )
+    parser.add_argument(
+        '--dedupe-media',
+        help='Collapse duplicate images and media into one part to shrink the output (.pptx only)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--low-memory',
+        help='Stream images and media instead of loading them, for decks with large media (.pptx only)',
+        action='store_true'
+    )
+    
+    parser.add_argument(
+        '--delta',
+        help="Write only the parts that differ from the input, for `pptmod materialize` to rebuild (.pptx only)",
+        action='store_true'
+    )
+    parser.add_argument(
+        '--parts',
+        help=f"Part types to replace text in: comma-separated from {', '.join(PART_TYPES)}, or all (default: slides, .pptx only)",
+        default=None
+    )
+    parser.add_argument(
+        '--slides',
+        help="Only render these slides, e.g. 3-7, 1,4,9-12 or a section name (.pptx only)",
+        default=None
+    )
+    
+    parser.add_argument(
+        '--data',
+        help='CSV or JSON rows; the repeat slide is cloned once per row (.pptx only)',
+        default=None
+    )
+    parser.add_argument(
+        '--repeat-slide',
+        help='Number of the slide to clone for each --data row (default: the slide containing {{repeat}})',
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        '--table',
+        help="Fill a table shape from a CSV file, as NAME=FILE.csv (repeatable, .pptx only)",
+        action='append',
+        default=[]
+    )
+    parser.add_argument(
+        '--charts',
+        help='JSON file of chart data keyed by chart shape name (.pptx only)',
+        default=None
+    )
+    parser.add_argument(
+        '--charts-cache-only',
+        help="Only update the values charts display, not their embedded workbooks (faster; Edit Data shows old values)",
+        action='store_true'
+    )
+    parser.add_argument(
+        '--stdio',
+        help='Run as a worker: read JSON jobs from stdin, one per line, and write JSON results to stdout',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--jobs',
+        help='Number of jobs to run at once with --stdio (default: 1)',
+        type=int,
+        default=1
+    )
+    parser.add_argument(
+        '--allow-provider',
+        help="Module or module:function that --stdio jobs may use as a replacement provider (repeatable)",
+        action='append',
+        default=[],
+        metavar='MODULE'
+    )
     
     args = parser.parse_args()
     
+    if args.stdio:
+        from stdio_worker import run_stdio
+        sys.exit(run_stdio(jobs=max(1, args.jobs), allowed_providers=args.allow_provider))
+    
+    if args.input is None:
+        parser.error("the following arguments are required: input")
+    
     # Validate input file
     if not os.path.exists(args.input):
         print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
@@ -195,12 +761,13 @@ def main():
     # Determine output file
     if args.output is None:
         input_path = Path(args.input)
-        args.output = str(input_path.parent / f"{input_path.stem}_modified{input_path.suffix}")
+        suffix = '.delta' if args.delta else input_path.suffix
+        args.output = str(input_path.parent / f"{input_path.stem}_modified{suffix}")
     
     # Load replacements from config
     replacements = load_config(args.config)
     
-    if not replacements:
+    if not replacements and args.data is None and not args.table and args.charts is None:
         print("Warning: No replacements found in config file", file=sys.stderr)
         sys.exit(1)
     
@@ -209,13 +776,86 @@ def main():
     # Determine file type and process accordingly
     file_ext = Path(args.input).suffix.lower()
     
-    if file_ext == '.pptx':
-        modify_pptx(args.input, args.output, replacements)
-    elif file_ext == '.ppt':
-        modify_ppt(args.input, args.output, replacements)
-    else:
+    if file_ext not in SUPPORTED_EXTENSIONS:
         print(f"Error: Unsupported file type '{file_ext}'. Only .ppt and .pptx are supported", file=sys.stderr)
         sys.exit(1)
+    
+    if args.low_memory and args.dedupe_media:
+        print("Warning: --dedupe-media is not supported with --low-memory and will be skipped", file=sys.stderr)
+    
+    options = {}
+    if args.parts is not None:
+        try:
+            options['parts'] = parse_parts(args.parts)
+        except ValueError:
+            print(f"Error: Invalid --parts '{args.parts}', choose from {', '.join(PART_TYPES)} or all", file=sys.stderr)
+            sys.exit(1)
+    
+    if args.delta:
+        if file_ext != '.pptx' or args.low_memory:
+            print("Error: --delta needs a .pptx input and cannot be combined with --low-memory", file=sys.stderr)
+            sys.exit(1)
+        options['delta'] = True
+    
+    if args.slides is not None:
+        if file_ext != '.pptx' or args.low_memory:
+            print("Error: --slides needs a .pptx input and cannot be combined with --low-memory", file=sys.stderr)
+            sys.exit(1)
+        from subset import check_selection
+        try:
+            check_selection(args.input, args.slides)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Error: Invalid --slides '{args.slides}': {e}", file=sys.stderr)
+            sys.exit(1)
+        options['slides'] = args.slides
+    
+    if args.data is not None:
+        if file_ext != '.pptx' or args.low_memory:
+            print("Error: --data needs a .pptx input and cannot be combined with --low-memory", file=sys.stderr)
+            sys.exit(1)
+        
+        from repeat import load_rows
+        try:
+            options['rows'] = load_rows(args.data)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load data file '{args.data}': {e}", file=sys.stderr)
+            sys.exit(1)
+        options['repeat_slide'] = args.repeat_slide
+        print(f"Loaded {len(options['rows'])} row(s) from {args.data}")
+    
+    if args.table:
+        if file_ext != '.pptx' or args.low_memory:
+            print("Error: --table needs a .pptx input and cannot be combined with --low-memory", file=sys.stderr)
+            sys.exit(1)
+        
+        options['tables'] = {}
+        for binding in args.table:
+            name, separator, csv_path = binding.partition('=')
+            if not separator or not name or not csv_path:
+                print(f"Error: Invalid --table '{binding}', expected NAME=FILE.csv", file=sys.stderr)
+                sys.exit(1)
+            if not os.path.exists(csv_path):
+                print(f"Error: Table data file '{csv_path}' not found", file=sys.stderr)
+                sys.exit(1)
+            options['tables'][name] = csv_path
+    
+    if args.charts is not None:
+        if file_ext != '.pptx' or args.low_memory:
+            print("Error: --charts needs a .pptx input and cannot be combined with --low-memory", file=sys.stderr)
+            sys.exit(1)
+        
+        from charts import load_chart_data
+        try:
+            options['charts'] = load_chart_data(args.charts)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load chart data file '{args.charts}': {e}", file=sys.stderr)
+            sys.exit(1)
+        options['chart_workbooks'] = not args.charts_cache_only
+    
+    if args.low_memory:
+        render(args.input, args.output, replacements, low_memory=True, parts=options.get('parts', DEFAULT_PARTS))
+    else:
+        render(args.input, args.output, replacements, optimize_media=args.dedupe_media, **options)
 
 
 if __name__ == "__main__":
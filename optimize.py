@@ -0,0 +1,145 @@
+"""
+PowerPoint template optimizer
+Backs `pptmod optimize-template`: merges adjacent text runs that share the same
+formatting and drops empty runs and proofing marks. PowerPoint tends to split
+text into many such runs as a template is edited, which bloats the XML and can
+split placeholders so they no longer match.
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict
+
+from lxml import etree
+
+from pptzip import rewrite_package
+
+
+_A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_A_P = f'{{{_A_NS}}}p'
+_A_R = f'{{{_A_NS}}}r'
+_A_T = f'{{{_A_NS}}}t'
+_A_RPR = f'{{{_A_NS}}}rPr'
+
+# Parts that can hold text: slides, layouts, masters and notes
+TEXT_PART_PATTERN = re.compile(
+    r'^ppt/(slides|slideLayouts|slideMasters|notesSlides|notesMasters|handoutMasters)/[^/]+\.xml$'
+)
+
+# Run properties that only record editing state, not formatting
+_NOISE_ATTRIBUTES = ('dirty', 'err', 'smtClean', 'smtId')
+
+
+def _strip_noise(run) -> None:
+    """Remove editing-state attributes from a run's properties."""
+    rPr = run.find(_A_RPR)
+    if rPr is not None:
+        for attribute in _NOISE_ATTRIBUTES:
+            rPr.attrib.pop(attribute, None)
+
+
+def _run_signature(run) -> bytes:
+    """Return a canonical form of a run's formatting."""
+    rPr = run.find(_A_RPR)
+    if rPr is None:
+        return b''
+    return etree.tostring(rPr, method='c14n')
+
+
+def defragment_paragraph(paragraph) -> int:
+    """Merge same-formatted adjacent runs in an a:p and drop empty runs.
+
+    Editing-state attributes (see _NOISE_ATTRIBUTES) are removed from each run,
+    so runs that differ only in those are merged.
+
+    Returns:
+        Number of runs removed
+    """
+    removed = 0
+    previous = None
+    previous_signature = None
+
+    for child in list(paragraph):
+        if etree.QName(child).localname == 'proofErr':
+            paragraph.remove(child)
+            continue
+
+        if child.tag != _A_R:
+            # Breaks, fields and other elements end a sequence of runs
+            previous = None
+            continue
+
+        text_element = child.find(_A_T)
+        text = text_element.text if text_element is not None else None
+        _strip_noise(child)
+        signature = _run_signature(child)
+
+        if not text:
+            paragraph.remove(child)
+            removed += 1
+        elif previous is not None and signature == previous_signature:
+            previous_text = previous.find(_A_T)
+            previous_text.text = (previous_text.text or '') + text
+            paragraph.remove(child)
+            removed += 1
+        else:
+            previous = child
+            previous_signature = signature
+
+    return removed
+
+
+def optimize_template(input_file: str, output_file: str) -> Dict[str, int]:
+    """Write a defragmented copy of a .pptx template.
+
+    Returns:
+        Stats: 'runs_removed', 'xml_bytes_removed' (uncompressed) and
+        'file_bytes_removed'
+    """
+    stats = {'runs_removed': 0, 'xml_bytes_removed': 0}
+
+    def edit_part(name: str, data: bytes) -> bytes:
+        root = etree.fromstring(data)
+        removed = sum(defragment_paragraph(paragraph) for paragraph in root.iter(_A_P))
+        if not removed:
+            return data
+        optimized = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+        stats['runs_removed'] += removed
+        stats['xml_bytes_removed'] += len(data) - len(optimized)
+        return optimized
+
+    rewrite_package(input_file, output_file, TEXT_PART_PATTERN.match, edit_part)
+    stats['file_bytes_removed'] = os.path.getsize(input_file) - os.path.getsize(output_file)
+    return stats
+
+
+def optimize_main(argv) -> int:
+    """Entry point for `pptmod optimize-template`."""
+    parser = argparse.ArgumentParser(
+        prog='pptmod optimize-template',
+        description="Merge fragmented text runs in a .pptx template so it renders faster"
+    )
+    parser.add_argument('input', help='Template to optimize (.pptx)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Output file path (default: input_optimized.pptx)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
+        return 1
+    if Path(args.input).suffix.lower() != '.pptx':
+        print("Error: Only .pptx templates can be optimized", file=sys.stderr)
+        return 1
+
+    if args.output is None:
+        input_path = Path(args.input)
+        args.output = str(input_path.parent / f"{input_path.stem}_optimized{input_path.suffix}")
+
+    stats = optimize_template(args.input, args.output)
+    print(f"Optimized {args.input} -> {args.output}")
+    print(f"Removed {stats['runs_removed']} run(s), {stats['xml_bytes_removed']} bytes of XML "
+          f"({stats['file_bytes_removed']} bytes from the file)")
+    return 0
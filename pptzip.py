@@ -0,0 +1,119 @@
+"""
+PowerPoint package (zip) helpers
+Read and rewrite .pptx packages entry by entry without loading them through python-pptx.
+"""
+
+import hashlib
+import shutil
+import struct
+import zipfile
+from typing import Callable, Optional
+
+
+# Size of the buffer used when streaming entries between packages
+CHUNK_SIZE = 1024 * 1024
+
+# Private zipfile helpers copy_entry_raw relies on
+_RAW_COPY_HELPERS = all(hasattr(zipfile, name) for name in (
+    'structFileHeader', 'sizeFileHeader', '_FH_FILENAME_LENGTH', '_FH_EXTRA_FIELD_LENGTH',
+)) and hasattr(zipfile.ZipInfo, 'FileHeader')
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_entry(zin: zipfile.ZipFile, info: zipfile.ZipInfo, zout: zipfile.ZipFile,
+               data: Optional[bytes] = None, chunk_size: int = CHUNK_SIZE,
+               compress_type: Optional[int] = None, name: Optional[str] = None) -> None:
+    """Copy one entry into zout, streaming it in fixed-size chunks, optionally renamed.
+
+    If data is given it is written instead of the original entry contents. The
+    copy keeps the entry's compression unless compress_type is given.
+    """
+    out_info = zipfile.ZipInfo(name or info.filename, date_time=info.date_time)
+    out_info.compress_type = info.compress_type if compress_type is None else compress_type
+    out_info.external_attr = info.external_attr
+
+    if data is not None:
+        zout.writestr(out_info, data)
+        return
+
+    force_zip64 = info.file_size > zipfile.ZIP64_LIMIT
+    with zin.open(info) as src, zout.open(out_info, 'w', force_zip64=force_zip64) as dst:
+        shutil.copyfileobj(src, dst, chunk_size)
+
+
+def copy_entry_raw(zin: zipfile.ZipFile, info: zipfile.ZipInfo, zout: zipfile.ZipFile,
+                   name: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> None:
+    """Copy one entry's compressed bytes into zout as they are, optionally renamed.
+
+    Nothing is inflated or deflated, so this costs about as much as a file copy.
+    zipfile has no public API for it, so this reads the local header and writes
+    the entry with the module's private helpers (stable from Python 3.8 to 3.13).
+    Where those helpers are missing, or zout can't seek, the entry is
+    recompressed with copy_entry instead.
+    """
+    if not (_RAW_COPY_HELPERS and getattr(zout, '_seekable', False)
+            and all(hasattr(zout, attr) for attr in ('_writecheck', 'start_dir', '_lock'))
+            and hasattr(zin, '_lock')):
+        copy_entry(zin, info, zout, chunk_size=chunk_size, name=name)
+        return
+
+    out_info = zipfile.ZipInfo(name or info.filename, date_time=info.date_time)
+    out_info.compress_type = info.compress_type
+    out_info.external_attr = info.external_attr
+    out_info.create_system = info.create_system
+    out_info.CRC = info.CRC
+    out_info.compress_size = info.compress_size
+    out_info.file_size = info.file_size
+    # Sizes go in the local header, so no data descriptor follows the data
+    out_info.flag_bits = info.flag_bits & ~0x08
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+
+    with zin._lock, zout._lock:
+        # Skip the source's local header to reach the compressed data
+        zin.fp.seek(info.header_offset)
+        header = struct.unpack(zipfile.structFileHeader, zin.fp.read(zipfile.sizeFileHeader))
+        zin.fp.seek(header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+
+        zout._writecheck(out_info)
+        zout._didModify = True
+        zout.fp.seek(zout.start_dir)
+        out_info.header_offset = zout.fp.tell()
+        zout.fp.write(out_info.FileHeader(zip64))
+
+        remaining = info.compress_size
+        while remaining:
+            chunk = zin.fp.read(min(chunk_size, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated entry '{info.filename}'")
+            zout.fp.write(chunk)
+            remaining -= len(chunk)
+
+        zout.filelist.append(out_info)
+        zout.NameToInfo[out_info.filename] = out_info
+        zout.start_dir = zout.fp.tell()
+
+
+def rewrite_package(input_file: str, output_file: str,
+                    select: Callable[[str], bool],
+                    edit: Callable[[str, bytes], bytes],
+                    chunk_size: int = CHUNK_SIZE) -> None:
+    """Copy a package, passing the selected entries through edit().
+
+    Only entries for which select(name) is true are inflated into memory; every
+    other entry is streamed from input to output in chunks of chunk_size bytes.
+    """
+    with zipfile.ZipFile(input_file, 'r') as zin, \
+            zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            if select(info.filename):
+                copy_entry(zin, info, zout, data=edit(info.filename, zin.read(info)))
+            else:
+                copy_entry(zin, info, zout, chunk_size=chunk_size)
@@ -0,0 +1,205 @@
+"""
+Repeat-slide rendering
+Clones one template slide per data row (a catalog page per product, a slide per
+region...). Clones share the template's layout, master and media parts; only the
+slide XML and its notes slide are copied.
+"""
+
+import copy
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.parts.slide import NotesSlidePart, SlidePart
+
+from main import DEFAULT_PARTS, Replacer, ValueCache, replace_in_presentation, replace_in_xml
+
+
+# Text that marks the slide to repeat when no slide number is given
+REPEAT_MARKER = '{{repeat}}'
+
+_R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def load_rows(data_path: str) -> List[Dict[str, str]]:
+    """Load data rows from a CSV file (header row = placeholders) or a JSON list of objects.
+
+    Values are returned as strings, with missing and null values as ''.
+    """
+    if Path(data_path).suffix.lower() == '.json':
+        with open(data_path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError(f"Data file '{data_path}' must contain a list of objects")
+    else:
+        with open(data_path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    # DictReader files cells beyond the header under the None key
+    return [{key: '' if value is None else str(value) for key, value in row.items() if key is not None}
+            for row in rows]
+
+
+def find_repeat_slide(prs) -> int:
+    """Return the 0-based index of the first slide containing REPEAT_MARKER."""
+    for index, slide in enumerate(prs.slides):
+        for text_element in slide.part._element.iter(qn('a:t')):
+            if text_element.text and REPEAT_MARKER in text_element.text:
+                return index
+    raise ValueError(f"No slide contains the repeat marker '{REPEAT_MARKER}'")
+
+
+def _relate_new_part(part, target, reltype: str) -> str:
+    """Relate part to a newly created target part, returning the rId.
+
+    relate_to() first scans every existing relationship for a match, which makes
+    adding thousands of slides quadratic. A new part cannot already be related,
+    so python-pptx 1.0's direct add is used when available.
+    """
+    rels = part.rels
+    if hasattr(rels, '_add_relationship'):
+        return rels._add_relationship(reltype, target)
+    return part.relate_to(target, reltype)
+
+
+def _remap_rIds(element, rId_map: Dict[str, str]) -> None:
+    """Rewrite r:* relationship references in a copied slide to the clone's rIds."""
+    for child in element.iter():
+        for name, value in child.attrib.items():
+            if name.startswith(f'{{{_R_NS}}}') and value in rId_map:
+                child.set(name, rId_map[value])
+
+
+class _SlideCloner:
+    """Creates slide parts copied from a template slide part, with its notes slide."""
+
+    def __init__(self, template_part, replace_notes: bool = False):
+        self.template_part = template_part
+        self.replace_notes = replace_notes
+        self.package = template_part.package
+        self.used_partnames = {str(part.partname) for part in self.package.iter_parts()}
+        self.next_numbers = {}
+        # Every relationship except notes is shared by the clones; each clone
+        # gets its own copy of the notes slide
+        self.shared_rels = [
+            rel for rel in template_part.rels.values() if rel.reltype != RT.NOTES_SLIDE
+        ]
+        self.notes_part = next(
+            (rel.target_part for rel in template_part.rels.values() if rel.reltype == RT.NOTES_SLIDE),
+            None
+        )
+
+    def _next_partname(self, template: str) -> PackURI:
+        """Return the first unused part name from a template like '/ppt/slides/slide%d.xml'."""
+        number = self.next_numbers.get(template, 1)
+        while template % number in self.used_partnames:
+            number += 1
+        self.next_numbers[template] = number
+        partname = template % number
+        self.used_partnames.add(partname)
+        return PackURI(partname)
+
+    @staticmethod
+    def _copy_rels(rels, part, element, targets: Dict[str, Any]) -> None:
+        """Give part the relationships rels of a template part, remapping rIds in element.
+
+        Relationships whose type is in targets point to the given part instead.
+        """
+        rId_map = {}
+        for rel in rels:
+            if rel.is_external:
+                new_rId = part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            else:
+                new_rId = _relate_new_part(part, targets.get(rel.reltype, rel.target_part), rel.reltype)
+            if new_rId != rel.rId:
+                rId_map[rel.rId] = new_rId
+        if rId_map:
+            _remap_rIds(element, rId_map)
+
+    def _clone_notes(self, slide_part, replacer: Replacer) -> int:
+        """Give slide_part a copy of the template's notes slide, returning its replacement count."""
+        element = copy.deepcopy(self.notes_part._element)
+        count = replace_in_xml(element, replacer) if self.replace_notes else 0
+        notes_part = NotesSlidePart(self._next_partname('/ppt/notesSlides/notesSlide%d.xml'),
+                                    self.notes_part.content_type, self.package, element)
+        self._copy_rels(self.notes_part.rels.values(), notes_part, element, {RT.SLIDE: slide_part})
+        _relate_new_part(slide_part, notes_part, RT.NOTES_SLIDE)
+        return count
+
+    def clone(self, replacer: Replacer):
+        """Return a new slide part with replacer applied and its replacement count."""
+        element = copy.deepcopy(self.template_part._element)
+        count = replace_in_xml(element, replacer)
+
+        part = SlidePart(partname=self._next_partname('/ppt/slides/slide%d.xml'),
+                         content_type=self.template_part.content_type,
+                         package=self.package, element=element)
+        self._copy_rels(self.shared_rels, part, element, {})
+        if self.notes_part is not None:
+            count += self._clone_notes(part, replacer)
+        return part, count
+
+
+def render_repeated(prs, rows: List[Dict[str, str]], replacements: Dict[str, Any],
+                    slide_number: Optional[int] = None,
+                    value_cache: Optional[ValueCache] = None, parts=DEFAULT_PARTS) -> int:
+    """Replace a template slide with one filled-in clone per row.
+
+    Each clone gets the row's values on top of replacements, with the repeat
+    marker removed; the other slides get replacements only. Clones are inserted
+    where the template slide was. Each clone gets its own copy of the template's
+    speaker notes, with the row's values applied if parts includes 'notes'.
+
+    Args:
+        slide_number: 1-based number of the template slide (default: the slide
+            containing REPEAT_MARKER).
+        value_cache: Cache for callable replacement values (see Replacer). The
+            rows always share one, so each value is computed at most once per
+            render; pass a dict to share it beyond this render too.
+        parts: Part types to apply replacements to besides the clones (see
+            main.PART_TYPES).
+
+    Returns:
+        Number of text replacements made
+    """
+    if slide_number is None:
+        index = find_repeat_slide(prs)
+    elif 1 <= slide_number <= len(prs.slides):
+        index = slide_number - 1
+    else:
+        raise ValueError(f"Slide {slide_number} does not exist (deck has {len(prs.slides)} slides)")
+
+    sldIdLst = prs.slides._sldIdLst
+    template_sldId = sldIdLst[index]
+    template_part = prs.part.related_part(template_sldId.rId)
+
+    cache = {} if value_cache is None else value_cache
+    other_slides = [slide for slide in prs.slides if slide.part is not template_part]
+    replacement_count = replace_in_presentation(prs, Replacer(replacements, cache=cache),
+                                                slides=other_slides, parts=parts)
+
+    cloner = _SlideCloner(template_part, replace_notes='notes' in parts)
+    next_id = max(int(sldId.get('id')) for sldId in sldIdLst) + 1
+    previous = template_sldId
+    for row in rows:
+        replacer = Replacer({**replacements, **row, REPEAT_MARKER: ''}, cache=cache)
+        part, count = cloner.clone(replacer)
+        replacement_count += count
+
+        sldId = OxmlElement('p:sldId')
+        sldId.set('id', str(next_id))
+        sldId.set(qn('r:id'), _relate_new_part(prs.part, part, RT.SLIDE))
+        previous.addnext(sldId)
+        previous = sldId
+        next_id += 1
+
+    # Drop the template; its notes slide is left unreferenced and is not saved
+    template_rId = template_sldId.rId
+    sldIdLst.remove(template_sldId)
+    prs.part.drop_rel(template_rId)
+    return replacement_count
@@ -0,0 +1,150 @@
+"""
+PowerPoint Text Modifier JSON-lines worker
+Backs `pptmod --stdio`: reads one JSON job per line on stdin and writes one JSON
+result per line to stdout, staying alive between jobs so imports, templates and
+compiled matchers stay warm.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from pptx import Presentation
+
+from main import Replacer, modify_pptx, parse_parts, render, resolve_providers
+
+
+class TemplateCache:
+    """Keep recently used template files in memory, keyed by path, size and mtime."""
+
+    def __init__(self, max_templates: int = 8):
+        self.max_templates = max_templates
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, path: str) -> bytes:
+        """Return the bytes of a template, reading it from disk only if it changed."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            data = self._templates.get(key)
+            if data is not None:
+                self._templates.move_to_end(key)
+                return data
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        with self._lock:
+            self._templates[key] = data
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return data
+
+
+def run_job(job: Dict[str, Any], templates: TemplateCache,
+            allowed_providers: Iterable[str] = ()) -> Dict[str, Any]:
+    """Render one job and return its result object.
+
+    A job has 'template', 'output', 'replacements' (values may be provider
+    specs, see load_provider; only those in allowed_providers are accepted) and
+    optional 'options' (keyword options for render(), e.g. rows, tables, charts,
+    slides or parts) and 'id'. The result carries the job id, the replacement
+    count and per-phase timings in seconds.
+    """
+    start = time.perf_counter()
+    result = {'id': job.get('id')}
+    try:
+        template = job['template']
+        output = job['output']
+        replacer = Replacer(resolve_providers(job['replacements'], allowed_providers))
+        options = dict(job.get('options', {}))
+        timings = {}
+
+        if 'parts' in options:
+            options['parts'] = parse_parts(options['parts'])
+
+        if Path(template).suffix.lower() == '.pptx' and not options.get('low_memory'):
+            # Parse the cached template; with a slide selection, modify_pptx
+            # reads only the selected slides from disk instead
+            options.pop('low_memory', None)
+            phase = time.perf_counter()
+            if options.get('slides') is None:
+                options['presentation'] = Presentation(io.BytesIO(templates.read(template)))
+            timings['load'] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            count = modify_pptx(template, output, replacer, **options)
+            timings['render'] = time.perf_counter() - phase
+        else:
+            # .ppt and low-memory jobs go through the regular engines
+            count = render(template, output, replacer, **options)
+
+        timings['total'] = time.perf_counter() - start
+        result.update({
+            'ok': True,
+            'output': output,
+            'replacements': count,
+            'timings': {phase: round(seconds, 4) for phase, seconds in timings.items()},
+        })
+    except Exception as e:
+        result.update({'ok': False, 'error': f"{type(e).__name__}: {e}"})
+    return result
+
+
+def run_stdio(jobs: int = 1, stdin=None, stdout=None, allowed_providers: Iterable[str] = ()) -> int:
+    """Process JSON-lines jobs from stdin until it closes.
+
+    With jobs > 1, up to that many jobs run at once and results are written as
+    they finish, so they may come back out of order; match them by 'id'.
+
+    Returns:
+        Exit code: 0 if every job succeeded, 1 otherwise
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    templates = TemplateCache()
+    write_lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(jobs * 2)
+    failures = 0
+
+    def write_result(result: Dict[str, Any]) -> None:
+        nonlocal failures
+        with write_lock:
+            if not result.get('ok'):
+                failures += 1
+            stdout.write(json.dumps(result) + '\n')
+            stdout.flush()
+
+    def process(job: Dict[str, Any]) -> None:
+        try:
+            write_result(run_job(job, templates, allowed_providers))
+        finally:
+            in_flight.release()
+
+    # Progress messages from the engines would corrupt the result stream
+    with contextlib.redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=jobs) as pool:
+        for line_number, line in enumerate(stdin, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job must be a JSON object")
+            except ValueError as e:
+                write_result({'id': None, 'ok': False, 'error': f"Invalid job on line {line_number}: {e}"})
+                continue
+
+            # Don't read ahead of the workers by more than a few jobs
+            in_flight.acquire()
+            pool.submit(process, job)
+
+    return 1 if failures else 0
@@ -0,0 +1,247 @@
+"""
+Slide-subset extraction
+Cuts a .pptx package down to a selection of its slides before python-pptx ever
+sees it. Only presentation.xml and relationship files are parsed: unselected
+slides are never inflated, and the parts only they use (media, charts, notes...)
+are left out of the reduced package. Links from a selected slide to an
+unselected one are removed, so the unselected slide does not come along.
+"""
+
+import io
+import posixpath
+import re
+import zipfile
+from typing import Dict, List, Sequence, Set, Union
+
+from lxml import etree
+
+from pptzip import copy_entry
+
+
+_P_NS = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+_A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_R_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+PRESENTATION_PART = 'ppt/presentation.xml'
+PRESENTATION_RELS = 'ppt/_rels/presentation.xml.rels'
+CONTENT_TYPES = '[Content_Types].xml'
+
+_RANGE_PATTERN = re.compile(r'^(\d+)\s*-\s*(\d+)$')
+
+
+def _rels_name(part_name: str) -> str:
+    """Return the relationships entry of a part, e.g. ppt/slides/_rels/slide1.xml.rels."""
+    directory, name = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', f'{name}.rels')
+
+
+def _resolve_target(part_name: str, target: str) -> str:
+    """Resolve a relationship target against the part it belongs to."""
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_name), target))
+
+
+def _slide_groups(presentation, sldIds) -> Dict[str, List[int]]:
+    """Return the slide numbers in each section and custom show, by lowercased name."""
+    by_id = {sldId.get('id'): number for number, sldId in enumerate(sldIds, 1)}
+    by_rId = {sldId.get(_R_ID): number for number, sldId in enumerate(sldIds, 1)}
+
+    groups = {}
+    for section in presentation.iter('{*}section'):
+        groups[section.get('name', '').lower()] = [
+            by_id[element.get('id')] for element in section.iter('{*}sldId') if element.get('id') in by_id
+        ]
+    # Custom shows refer to slides through the presentation's relationships
+    for show in presentation.iter(f'{{{_P_NS}}}custShow'):
+        groups.setdefault(show.get('name', '').lower(), [
+            by_rId[element.get(_R_ID)] for element in show.iter(f'{{{_P_NS}}}sld')
+            if element.get(_R_ID) in by_rId
+        ])
+    return groups
+
+
+def parse_selection(spec: str, presentation) -> List[int]:
+    """Turn a selection such as '3-7', '1,4,9-12' or 'Appendix' into 1-based slide numbers.
+
+    Each comma-separated item is a slide number, a range, or the name of a
+    section or custom show (not case-sensitive), which selects all its slides.
+    """
+    sldIds = list(presentation.iter(f'{{{_P_NS}}}sldId'))
+    groups = None
+
+    numbers = []
+    for item in (item.strip() for item in spec.split(',')):
+        if not item:
+            continue
+        match = _RANGE_PATTERN.match(item)
+        if item.isdigit():
+            numbers.append(int(item))
+        elif match:
+            first, last = int(match.group(1)), int(match.group(2))
+            if first > last:
+                raise ValueError(f"Invalid slide range '{item}'")
+            numbers.extend(range(first, last + 1))
+        else:
+            if groups is None:
+                groups = _slide_groups(presentation, sldIds)
+            if item.lower() not in groups:
+                available = ', '.join(sorted(groups)) or 'none'
+                raise ValueError(f"No section or custom show named '{item}' "
+                                 f"(sections and custom shows: {available})")
+            numbers.extend(groups[item.lower()])
+    return numbers
+
+
+def _selected_numbers(selection: Union[str, Sequence[int]], presentation) -> List[int]:
+    """Return the slide numbers of a selection, raising ValueError if any slide is missing."""
+    numbers = parse_selection(selection, presentation) if isinstance(selection, str) else list(selection)
+    slide_count = sum(1 for _ in presentation.iter(f'{{{_P_NS}}}sldId'))
+    invalid = [number for number in numbers if not 1 <= number <= slide_count]
+    if invalid:
+        raise ValueError(f"Slide {invalid[0]} does not exist (deck has {slide_count} slides)")
+    if not numbers:
+        raise ValueError("The slide selection is empty")
+    return numbers
+
+
+def check_selection(input_file: str, selection: Union[str, Sequence[int]]) -> List[int]:
+    """Validate a slide selection against a deck, reading only presentation.xml.
+
+    Returns:
+        The selected 1-based slide numbers
+    """
+    with zipfile.ZipFile(input_file, 'r') as zin:
+        presentation = etree.fromstring(zin.read(PRESENTATION_PART))
+    return _selected_numbers(selection, presentation)
+
+
+def _prune_presentation(presentation, kept_ids: Set[str], kept_rIds: Set[str]) -> None:
+    """Drop unselected slides from sldIdLst, sections and custom shows."""
+    for sldId in list(presentation.iter(f'{{{_P_NS}}}sldId')):
+        if sldId.get('id') not in kept_ids:
+            sldId.getparent().remove(sldId)
+
+    # Sections refer to slides by id; remove the sections left empty
+    for section in list(presentation.iter('{*}section')):
+        for sldId in list(section.iter('{*}sldId')):
+            if sldId.get('id') not in kept_ids:
+                sldId.getparent().remove(sldId)
+        if not any(True for _ in section.iter('{*}sldId')):
+            section.getparent().remove(section)
+
+    # Custom shows refer to slides through the presentation's relationships
+    for show in list(presentation.iter(f'{{{_P_NS}}}custShow')):
+        for sld in list(show.iter(f'{{{_P_NS}}}sld')):
+            if sld.get(_R_ID) not in kept_rIds:
+                sld.getparent().remove(sld)
+        if not any(True for _ in show.iter(f'{{{_P_NS}}}sld')):
+            show_list = show.getparent()
+            show_list.remove(show)
+            if not len(show_list):
+                show_list.getparent().remove(show_list)
+
+
+def _unlink(part_xml: bytes, rIds: Set[str]) -> bytes:
+    """Remove the click and hover hyperlinks of a part that use the given relationships."""
+    root = etree.fromstring(part_xml)
+    for link in list(root.iter(f'{{{_A_NS}}}hlinkClick', f'{{{_A_NS}}}hlinkHover')):
+        if link.get(_R_ID) in rIds:
+            link.getparent().remove(link)
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _reachable_parts(zin: zipfile.ZipFile, names: Set[str], overrides: Dict[str, bytes],
+                     excluded: Set[str] = frozenset()) -> Set[str]:
+    """Walk the relationship graph from the package root, returning every part reached.
+
+    Relationships to excluded parts (the unselected slides) are not followed: they
+    are removed, along with the hyperlinks using them, and the edited relationship
+    and part XML are added to overrides.
+    """
+    reached = set()
+    pending = ['']
+    while pending:
+        part_name = pending.pop()
+        rels_name = '_rels/.rels' if not part_name else _rels_name(part_name)
+        if rels_name not in names:
+            continue
+        rels = etree.fromstring(overrides.get(rels_name) or zin.read(rels_name))
+        dropped = set()
+        for rel in list(rels.iter(f'{{{_REL_NS}}}Relationship')):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = _resolve_target(part_name, rel.get('Target'))
+            if target in excluded:
+                # e.g. a hyperlink or zoom from a selected slide to an unselected one
+                rels.remove(rel)
+                dropped.add(rel.get('Id'))
+            elif target in names and target not in reached:
+                reached.add(target)
+                pending.append(target)
+        if dropped:
+            overrides[rels_name] = etree.tostring(rels, xml_declaration=True,
+                                                  encoding='UTF-8', standalone=True)
+            if part_name.endswith('.xml'):
+                overrides[part_name] = _unlink(overrides.get(part_name) or zin.read(part_name), dropped)
+    return reached
+
+
+def extract_slides(input_file: str, selection: Union[str, Sequence[int]]) -> io.BytesIO:
+    """Build a package holding only the selected slides of a .pptx file.
+
+    Args:
+        selection: 1-based slide numbers, or a selection string (see
+            parse_selection). Slides keep their order in the deck.
+
+    Returns:
+        The reduced package, ready to be opened with Presentation()
+    """
+    with zipfile.ZipFile(input_file, 'r') as zin:
+        names = set(zin.namelist())
+        presentation = etree.fromstring(zin.read(PRESENTATION_PART))
+        presentation_rels = etree.fromstring(zin.read(PRESENTATION_RELS))
+
+        numbers = _selected_numbers(selection, presentation)
+        sldIds = list(presentation.iter(f'{{{_P_NS}}}sldId'))
+        kept = {sldIds[number - 1] for number in numbers}
+        kept_ids = {sldId.get('id') for sldId in kept}
+        kept_rIds = {sldId.get(_R_ID) for sldId in kept}
+        dropped_rIds = {sldId.get(_R_ID) for sldId in sldIds} - kept_rIds
+
+        _prune_presentation(presentation, kept_ids, kept_rIds)
+        dropped_slides = set()
+        for rel in list(presentation_rels.iter(f'{{{_REL_NS}}}Relationship')):
+            if rel.get('Id') in dropped_rIds:
+                dropped_slides.add(_resolve_target(PRESENTATION_PART, rel.get('Target')))
+                presentation_rels.remove(rel)
+
+        overrides = {
+            PRESENTATION_PART: etree.tostring(presentation, xml_declaration=True,
+                                              encoding='UTF-8', standalone=True),
+            PRESENTATION_RELS: etree.tostring(presentation_rels, xml_declaration=True,
+                                              encoding='UTF-8', standalone=True),
+        }
+        reached = _reachable_parts(zin, names, overrides, excluded=dropped_slides)
+        keep = {CONTENT_TYPES, '_rels/.rels'} | reached | {
+            _rels_name(part) for part in reached if _rels_name(part) in names
+        }
+
+        content_types = etree.fromstring(zin.read(CONTENT_TYPES))
+        for override in list(content_types.iter(f'{{{_CT_NS}}}Override')):
+            if override.get('PartName', '').lstrip('/') not in keep:
+                content_types.remove(override)
+        overrides[CONTENT_TYPES] = etree.tostring(content_types, xml_declaration=True,
+                                                  encoding='UTF-8', standalone=True)
+
+        # The copy is only read back by python-pptx, so skip compressing it
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w') as zout:
+            for info in zin.infolist():
+                if info.filename in keep:
+                    copy_entry(zin, info, zout, data=overrides.get(info.filename),
+                               compress_type=zipfile.ZIP_STORED)
+    output.seek(0)
+    return output
@@ -0,0 +1,173 @@
+"""
+Bulk table binding
+Fills a named table shape from a CSV file, a list of rows or columnar arrays,
+writing the cell text directly into the table XML. Rows are added or removed to
+fit the data, each copied from a template row so it keeps its formatting.
+"""
+
+import copy
+import csv
+from typing import Any, Dict, List, Optional, Sequence
+
+from pptx.oxml.ns import qn
+from pptx.util import Emu
+
+from main import escape_ctrl_chars, iter_shapes
+
+
+def load_table_data(source: Any) -> List[List[str]]:
+    """Normalize table data to a list of rows of strings.
+
+    Args:
+        source: Path to a CSV file (its header line is skipped), a list of rows,
+            or a dict of column name -> values (columnar arrays).
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+        rows = rows[1:]
+    elif isinstance(source, dict):
+        columns = list(source.values())
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        rows = [list(row) for row in zip(*columns)]
+    else:
+        rows = [list(row) for row in source]
+
+    return [['' if value is None else str(value) for value in row] for row in rows]
+
+
+def find_table_shape(prs, name: str):
+    """Return the table graphic frame named name from any slide."""
+    for slide in prs.slides:
+        for shape in iter_shapes(slide.shapes):
+            if shape.name == name and getattr(shape, 'has_table', False):
+                return shape
+    raise ValueError(f"No table named '{name}' found in the presentation")
+
+
+def _normalize_cell(tc) -> None:
+    """Reduce a cell to one paragraph with one run, keeping the first run's formatting."""
+    txBody = tc.find(qn('a:txBody'))
+    paragraphs = txBody.findall(qn('a:p'))
+    for paragraph in paragraphs[1:]:
+        txBody.remove(paragraph)
+    paragraph = paragraphs[0]
+
+    runs = paragraph.findall(qn('a:r'))
+    for child in list(paragraph):
+        if child.tag in (qn('a:br'), qn('a:fld')) or (child.tag == qn('a:r') and child is not runs[0]):
+            paragraph.remove(child)
+
+    if not runs:
+        # Empty cell: build a run styled like the paragraph end mark
+        run = paragraph.makeelement(qn('a:r'), {})
+        end_properties = paragraph.find(qn('a:endParaRPr'))
+        if end_properties is not None:
+            properties = run.makeelement(qn('a:rPr'), dict(end_properties.attrib))
+            properties.extend(copy.deepcopy(child) for child in end_properties)
+            run.append(properties)
+        run.append(run.makeelement(qn('a:t'), {}))
+        if end_properties is not None:
+            end_properties.addprevious(run)
+        else:
+            paragraph.append(run)
+
+
+def _set_cell_text(text_element, value: str) -> None:
+    """Set the text of a normalized cell's run, the way python-pptx's cell.text does.
+
+    Line feeds start a new paragraph and vertical tabs (PowerPoint's soft line
+    breaks) become a:br, each piece keeping the run's formatting; other control
+    characters are escaped.
+    """
+    value = value.replace('\r\n', '\n')
+    if '\n' not in value and '\v' not in value:
+        text_element.text = escape_ctrl_chars(value)
+        return
+
+    run = text_element.getparent()
+    paragraph = run.getparent()
+    template_paragraph = copy.deepcopy(paragraph)
+    properties = run.find(qn('a:rPr'))
+    for index, line in enumerate(value.split('\n')):
+        if index:
+            next_paragraph = copy.deepcopy(template_paragraph)
+            paragraph.addnext(next_paragraph)
+            paragraph = next_paragraph
+            run = paragraph.find(qn('a:r'))
+        for piece_index, piece in enumerate(line.split('\v')):
+            if piece_index:
+                line_break = run.makeelement(qn('a:br'), {})
+                if properties is not None:
+                    line_break.append(copy.deepcopy(properties))
+                run.addprevious(line_break)
+            # Like python-pptx, no empty runs between breaks
+            if piece:
+                piece_run = copy.deepcopy(run)
+                piece_run.find(qn('a:t')).text = escape_ctrl_chars(piece)
+                run.addprevious(piece_run)
+        paragraph.remove(run)
+
+
+def bind_table(shape, rows: Sequence[Sequence[str]], header_rows: Optional[int] = None) -> int:
+    """Replace the data rows of a table shape with rows.
+
+    Args:
+        header_rows: Leading rows to keep as they are (default: 1 if the table
+            has PowerPoint's header row option turned on, else 0). The first row
+            after them is the template for every data row.
+
+    Returns:
+        Number of cells written
+    """
+    tbl = shape.table._tbl
+    table_rows = tbl.findall(qn('a:tr'))
+    column_count = len(tbl.find(qn('a:tblGrid')).findall(qn('a:gridCol')))
+
+    if header_rows is None:
+        tblPr = tbl.find(qn('a:tblPr'))
+        header_rows = 1 if tblPr is not None and tblPr.get('firstRow') in ('1', 'true') else 0
+    if header_rows >= len(table_rows):
+        raise ValueError(f"Table '{shape.name}' has no row after its header to use as a template")
+
+    for row_number, row in enumerate(rows, 1):
+        if len(row) > column_count:
+            raise ValueError(f"Row {row_number} has {len(row)} values but table '{shape.name}' "
+                             f"has {column_count} columns")
+
+    # Prepare the template row once so each copy only needs its text set
+    template = copy.deepcopy(table_rows[header_rows])
+    for tc in template.findall(qn('a:tc')):
+        _normalize_cell(tc)
+
+    for tr in table_rows[header_rows:]:
+        tbl.remove(tr)
+
+    cells_written = 0
+    for row in rows:
+        tr = copy.deepcopy(template)
+        text_elements = tr.findall(f"{qn('a:tc')}/{qn('a:txBody')}/{qn('a:p')}/{qn('a:r')}/{qn('a:t')}")
+        for text_element, value in zip(text_elements, row):
+            _set_cell_text(text_element, value)
+            cells_written += 1
+        for text_element in text_elements[len(row):]:
+            text_element.text = ''
+        tbl.append(tr)
+
+    # Grow or shrink the frame to fit the rows
+    shape.height = Emu(sum(int(tr.get('h', 0)) for tr in tbl.findall(qn('a:tr'))))
+    return cells_written
+
+
+def bind_tables(prs, tables: Dict[str, Any]) -> int:
+    """Fill several named tables; values are anything load_table_data accepts.
+
+    Returns:
+        Number of cells written
+    """
+    return sum(
+        bind_table(find_table_shape(prs, name), load_table_data(source))
+        for name, source in tables.items()
+    )
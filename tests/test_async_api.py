@@ -0,0 +1,64 @@
+"""
+render_many() must respect its concurrency limit even when jobs time out.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import async_api
+from async_api import RenderJob, render_async, render_many
+
+
+class FakeRender:
+    """Stands in for render(), recording how many calls run at once."""
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    def __call__(self, input_file, output_file, replacements, **options):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(options)
+        time.sleep(self.duration)
+        with self.lock:
+            self.active -= 1
+        return 1
+
+
+async def collect(jobs, executor, **kwargs):
+    return [result async for result in render_many(jobs, executor=executor, **kwargs)]
+
+
+def test_timed_out_renders_keep_their_slot(monkeypatch):
+    fake = FakeRender(duration=0.2)
+    monkeypatch.setattr(async_api, 'render', fake)
+    jobs = [(f'in{i}.pptx', f'out{i}.pptx', {}) for i in range(6)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = asyncio.run(collect(jobs, pool, concurrency=2, timeout=0.02))
+
+    assert len(results) == 6
+    assert all(isinstance(result.error, asyncio.TimeoutError) for result in results)
+    assert fake.peak == 2
+
+
+def test_options_are_passed_to_render(monkeypatch):
+    fake = FakeRender(duration=0)
+    monkeypatch.setattr(async_api, 'render', fake)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        asyncio.run(render_async('in.pptx', 'out.pptx', {}, executor=pool, optimize_media=True))
+        results = asyncio.run(collect(
+            [RenderJob('in.pptx', 'out.pptx', {}, options={'parts': ('notes',)}),
+             ('in.pptx', 'out2.pptx', {}, None, {'low_memory': True})],
+            pool, concurrency=1))
+
+    assert [result.replacement_count for result in results] == [1, 1]
+    assert fake.calls == [{'optimize_media': True}, {'parts': ('notes',)}, {'low_memory': True}]
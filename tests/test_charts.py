@@ -0,0 +1,140 @@
+"""
+Binding chart data updates the cache, formulas and embedded workbook.
+"""
+
+import io
+import zipfile
+
+from lxml import etree
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.oxml.ns import qn
+from pptx.util import Inches
+
+from charts import _patch_sheet, bind_charts
+
+_SS_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+
+SHEET = f'''<worksheet xmlns="{_SS_NS}"><dimension ref="A1:C4"/><sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="C1" t="s"><v>1</v></c></row>
+<row r="2"><c r="A2" t="s"><v>2</v></c><c r="C2" s="1"><v>1.5</v></c></row>
+<row r="3"><c r="A3" t="s"><v>3</v></c><c r="C3" s="1"><v>2.5</v></c></row>
+<row r="4"><c r="A4" t="s"><v>4</v></c><c r="C4" s="1"><v>3.5</v></c></row>
+</sheetData></worksheet>'''.encode()
+
+
+def cell_styles(sheet_xml):
+    worksheet = etree.fromstring(sheet_xml)
+    return {cell.get('r'): cell.get('s') for cell in worksheet.iter(f'{{{_SS_NS}}}c')}
+
+
+def test_new_cells_copy_the_style_of_a_cleared_cell_above():
+    # C4 is cleared in the same pass that creates C5 and C6 below it
+    styles = cell_styles(_patch_sheet(SHEET, {(3, 4): None, (3, 5): 2, (3, 6): 3}))
+
+    assert 'C4' not in styles
+    assert styles['C5'] == styles['C6'] == '1'
+
+
+def test_cleared_cells_are_removed():
+    styles = cell_styles(_patch_sheet(SHEET, {(3, 3): None, (3, 4): None}))
+
+    assert 'C3' not in styles and 'C4' not in styles
+    assert styles['C2'] == '1'
+
+
+def chart_deck(categories, series):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    chart_data = CategoryChartData()
+    chart_data.categories = categories
+    for name, values in series.items():
+        chart_data.add_series(name, values)
+    graphic_frame = slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(1), Inches(1),
+                                           Inches(6), Inches(4), chart_data)
+    graphic_frame.name = 'Sales'
+    return prs, graphic_frame.chart_part
+
+
+def sheet_values(chart_part):
+    """Cell reference -> value of the first worksheet of the chart's workbook."""
+    with zipfile.ZipFile(io.BytesIO(chart_part.chart_workbook.xlsx_part.blob)) as zin:
+        names = zin.namelist()
+        shared = []
+        if 'xl/sharedStrings.xml' in names:
+            strings = etree.fromstring(zin.read('xl/sharedStrings.xml'))
+            shared = [''.join(si.itertext()) for si in strings.iter(f'{{{_SS_NS}}}si')]
+        worksheet = etree.fromstring(zin.read('xl/worksheets/sheet1.xml'))
+
+    values = {}
+    for cell in worksheet.iter(f'{{{_SS_NS}}}c'):
+        if cell.get('t') == 's':
+            values[cell.get('r')] = shared[int(cell.findtext(f'{{{_SS_NS}}}v'))]
+        elif cell.get('t') == 'inlineStr':
+            values[cell.get('r')] = ''.join(cell.find(f'{{{_SS_NS}}}is').itertext())
+        else:
+            values[cell.get('r')] = float(cell.findtext(f'{{{_SS_NS}}}v'))
+    return values, worksheet
+
+
+def cached(element):
+    return (int(element.find(qn('c:ptCount')).get('val')),
+            [pt.findtext(qn('c:v')) for pt in element.iter(qn('c:pt'))])
+
+
+def test_bind_charts_resizes_cache_workbook_and_formulas():
+    prs, chart_part = chart_deck(['North', 'South', 'East', 'West'],
+                                 {'2024': (1, 2, 3, 4), '2025': (5, 6, 7, 8)})
+
+    bind_charts(prs, {'Sales': {'categories': ['North', 'South'],
+                                'series': {'Actual': [10, 20], 'Plan': [30, 40]}}})
+
+    sers = list(chart_part._element.iter(qn('c:ser')))
+    assert [ser.findtext(f"{qn('c:tx')}/{qn('c:strRef')}/{qn('c:f')}") for ser in sers] == \
+        ['Sheet1!$B$1', 'Sheet1!$C$1']
+    assert [ser.findtext(f"{qn('c:cat')}//{qn('c:f')}") for ser in sers] == ['Sheet1!$A$2:$A$3'] * 2
+    assert [ser.findtext(f"{qn('c:val')}//{qn('c:f')}") for ser in sers] == \
+        ['Sheet1!$B$2:$B$3', 'Sheet1!$C$2:$C$3']
+    assert cached(sers[0].find(qn('c:cat')).find('.//' + qn('c:strCache'))) == (2, ['North', 'South'])
+    assert cached(sers[1].find('.//' + qn('c:numCache'))) == (2, ['30', '40'])
+    assert cached(sers[0].find('.//' + qn('c:tx')).find('.//' + qn('c:strCache'))) == (1, ['Actual'])
+
+    values, worksheet = sheet_values(chart_part)
+    assert values == {'B1': 'Actual', 'C1': 'Plan',
+                      'A2': 'North', 'B2': 10, 'C2': 30,
+                      'A3': 'South', 'B3': 20, 'C3': 40}
+    # Rows 4 and 5 lost all their cells and are dropped rather than left empty
+    assert [row.get('r') for row in worksheet.iter(f'{{{_SS_NS}}}row')] == ['1', '2', '3']
+    assert worksheet.find(f'{{{_SS_NS}}}dimension').get('ref') == 'A1:C3'
+
+
+def test_bind_charts_grows_series():
+    prs, chart_part = chart_deck(['North', 'South'], {'2024': (1, 2)})
+
+    bind_charts(prs, {'Sales': {'categories': ['North', 'South', 'East'], 'series': [[4, 5, 6]]}})
+
+    ser = next(chart_part._element.iter(qn('c:ser')))
+    assert ser.findtext(f"{qn('c:cat')}//{qn('c:f')}") == 'Sheet1!$A$2:$A$4'
+    assert ser.findtext(f"{qn('c:val')}//{qn('c:f')}") == 'Sheet1!$B$2:$B$4'
+    assert cached(ser.find('.//' + qn('c:numCache'))) == (3, ['4', '5', '6'])
+
+    values, _ = sheet_values(chart_part)
+    assert (values['A4'], values['B2'], values['B3'], values['B4']) == ('East', 4, 5, 6)
+
+
+def test_bind_charts_cache_only_leaves_the_workbook():
+    prs, chart_part = chart_deck(['North', 'South'], {'2024': (1, 2)})
+    blob = chart_part.chart_workbook.xlsx_part.blob
+
+    bind_charts(prs, {'Sales': {'series': [[7, 8]]}}, update_workbooks=False)
+
+    assert cached(next(chart_part._element.iter(qn('c:numCache')))) == (2, ['7', '8'])
+    assert chart_part.chart_workbook.xlsx_part.blob == blob
+
+
+def test_rows_left_without_cells_are_dropped():
+    worksheet = etree.fromstring(_patch_sheet(SHEET, {(1, 4): None, (3, 4): None}))
+
+    assert [row.get('r') for row in worksheet.iter(f'{{{_SS_NS}}}row')] == ['1', '2', '3']
+    assert worksheet.find(f'{{{_SS_NS}}}dimension').get('ref') == 'A1:C3'
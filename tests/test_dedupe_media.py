@@ -0,0 +1,97 @@
+"""
+Media deduplication: identical images collapse onto one part.
+"""
+
+import io
+import posixpath
+import zipfile
+
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.util import Inches
+
+from main import modify_pptx
+
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+
+def png(color):
+    stream = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(stream, 'PNG')
+    return stream.getvalue()
+
+
+def image_targets(path):
+    """Slide name -> media part names its image relationships point at."""
+    targets = {}
+    with zipfile.ZipFile(path) as zf:
+        for name in zf.namelist():
+            if not (name.startswith('ppt/slides/_rels/') and name.endswith('.rels')):
+                continue
+            slide = name.replace('_rels/', '')[:-len('.rels')]
+            rels = etree.fromstring(zf.read(name))
+            targets[slide] = [
+                posixpath.normpath(posixpath.join('ppt/slides', rel.get('Target')))
+                for rel in rels.iter(f'{{{_REL_NS}}}Relationship') if rel.get('Type') == RT.IMAGE
+            ]
+    return targets
+
+
+def make_deck(path):
+    """Three slides with a picture each; slides 1 and 3 get byte-identical images
+    stored under different part names."""
+    red, blue = png('red'), png('blue')
+    prs = Presentation()
+    for color in ('red', 'blue', 'green'):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = '{{title}}'
+        slide.shapes.add_picture(io.BytesIO(png(color)), Inches(1), Inches(2))
+    staged = io.BytesIO()
+    prs.save(staged)
+
+    # python-pptx shares identical images when adding them, so the duplicate is
+    # written into the package afterwards
+    targets = image_targets(staged)
+    red_name, blue_name, duplicate_name = (targets[f'ppt/slides/slide{n}.xml'][0] for n in (1, 2, 3))
+    with zipfile.ZipFile(staged) as zin, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = red if item.filename == duplicate_name else zin.read(item.filename)
+            zout.writestr(item, data)
+    return red_name, blue_name, duplicate_name, len(red)
+
+
+def test_identical_media_is_stored_once(tmp_path, capsys):
+    template = tmp_path / 'template.pptx'
+    output = tmp_path / 'output.pptx'
+    red_name, blue_name, duplicate_name, duplicate_size = make_deck(template)
+
+    assert modify_pptx(str(template), str(output), {'{{title}}': 'Report'}, optimize_media=True) == 3
+
+    with zipfile.ZipFile(output) as zf:
+        media = sorted(name for name in zf.namelist() if name.startswith('ppt/media/'))
+        assert media == sorted([red_name, blue_name])
+        assert zf.read(red_name) == png('red')
+    assert image_targets(output) == {
+        'ppt/slides/slide1.xml': [red_name],
+        'ppt/slides/slide2.xml': [blue_name],
+        'ppt/slides/slide3.xml': [red_name],
+    }
+    assert f"saved {duplicate_size} bytes" in capsys.readouterr().out
+
+
+def test_distinct_media_is_left_alone(tmp_path, capsys):
+    template = tmp_path / 'template.pptx'
+    output = tmp_path / 'output.pptx'
+    prs = Presentation()
+    for color in ('red', 'blue'):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_picture(io.BytesIO(png(color)), Inches(1), Inches(1))
+    prs.save(template)
+
+    modify_pptx(str(template), str(output), {'{{title}}': 'Report'}, optimize_media=True)
+
+    with zipfile.ZipFile(output) as zf:
+        assert len([name for name in zf.namelist() if name.startswith('ppt/media/')]) == 2
+    assert "saved 0 bytes" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+"""
+A materialized delta must hold the same content as a full render.
+"""
+
+import zipfile
+
+import pytest
+from lxml import etree
+
+import delta as delta_module
+import pptzip
+from bench import generate_deck
+from delta import materialize
+from main import modify_pptx
+
+REPLACEMENTS = {"{{NAME}}": "John Doe", "{{COMPANY}}": "Acme Corporation"}
+
+
+def package_contents(path):
+    """Return entry name -> content, with XML in canonical form."""
+    contents = {}
+    with zipfile.ZipFile(path) as package:
+        for info in package.infolist():
+            data = package.read(info)
+            if info.filename.endswith(('.xml', '.rels')):
+                data = etree.tostring(etree.fromstring(data), method='c14n')
+            contents[info.filename] = data
+    return contents
+
+
+@pytest.mark.parametrize('raw_copy', [True, False])
+def test_materialize_matches_full_render(tmp_path, monkeypatch, raw_copy):
+    if not raw_copy:
+        monkeypatch.setattr(pptzip, '_RAW_COPY_HELPERS', False)
+    template = tmp_path / "template.pptx"
+    full = tmp_path / "full.pptx"
+    delta = tmp_path / "out.delta"
+    rebuilt = tmp_path / "rebuilt.pptx"
+    generate_deck(str(template), slides=10, media_mb=2)
+
+    modify_pptx(str(template), str(full), REPLACEMENTS)
+    modify_pptx(str(template), str(delta), REPLACEMENTS, delta=True)
+    materialize(str(delta), str(rebuilt))
+
+    with zipfile.ZipFile(rebuilt) as package:
+        assert package.testzip() is None
+    assert package_contents(rebuilt) == package_contents(full)
+    assert delta.stat().st_size < template.stat().st_size / 10
+
+
+def test_template_digest_is_cached(tmp_path, monkeypatch):
+    template = tmp_path / "template.pptx"
+    generate_deck(str(template), slides=2, media_mb=1)
+    hashed = []
+    monkeypatch.setattr(delta_module, 'file_sha256', lambda path: hashed.append(path) or 'digest')
+    delta_module._cached_sha256.cache_clear()
+
+    for number in range(3):
+        modify_pptx(str(template), str(tmp_path / f"out{number}.delta"), REPLACEMENTS, delta=True)
+    assert len(hashed) == 1
+
+    # A changed template is hashed again
+    template.write_bytes(template.read_bytes() + b'\0')
+    delta_module.template_sha256(str(template))
+    assert len(hashed) == 2
+    delta_module._cached_sha256.cache_clear()
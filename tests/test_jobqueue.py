@@ -0,0 +1,60 @@
+"""
+Job leases: renewed while a job runs, and not retried forever once they expire.
+"""
+
+import time
+
+from jobqueue import FAILED, RUNNING, JobQueue, lease_heartbeat, run_worker
+
+
+def add_job(queue):
+    queue.add([{'template': 't.pptx', 'output': 'out.pptx', 'replacements': {}}])
+
+
+def job_row(queue):
+    return queue.conn.execute('SELECT * FROM jobs').fetchone()
+
+
+def test_expired_job_fails_after_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / 'queue.db'), lease_seconds=0, max_attempts=2)
+    add_job(queue)
+
+    # Each worker "crashes": the lease expires without complete() or fail()
+    assert queue.claim('worker-1') is not None
+    time.sleep(0.01)
+    assert queue.claim('worker-2') is not None
+    time.sleep(0.01)
+    assert queue.claim('worker-3') is None
+
+    job = job_row(queue)
+    assert job['status'] == FAILED
+    assert job['attempts'] == 2
+    assert not queue.has_unfinished()
+    queue.close()
+
+
+def test_heartbeat_keeps_the_lease(tmp_path):
+    queue = JobQueue(str(tmp_path / 'queue.db'), lease_seconds=0.3)
+    add_job(queue)
+    job = queue.claim('worker-1')
+
+    with lease_heartbeat(queue, job['id'], 'worker-1'):
+        time.sleep(0.8)
+        assert queue.claim('worker-2') is None
+
+    job = job_row(queue)
+    assert job['status'] == RUNNING and job['worker'] == 'worker-1'
+    assert job['lease_expires'] > time.time()
+    queue.close()
+
+
+def test_worker_rejects_providers_that_are_not_allowed(tmp_path):
+    queue = JobQueue(str(tmp_path / 'queue.db'), max_attempts=1)
+    queue.add([{'template': str(tmp_path / 't.pptx'), 'output': str(tmp_path / 'out.pptx'),
+                'replacements': {'{{X}}': {'provider': 'os:system', 'args': ['echo pwned']}}}])
+
+    assert run_worker(queue, 'worker-1', poll_interval=0) == 0
+    job = job_row(queue)
+    assert job['status'] == FAILED
+    assert "not allowed" in job['error']
+    queue.close()
@@ -0,0 +1,34 @@
+"""
+Peak memory of the --low-memory engine must not grow with the size of the media.
+"""
+
+import tracemalloc
+
+import pytest
+
+from bench import generate_deck
+from main import modify_pptx_streaming
+
+
+# Tracemalloc peak allowed for a streaming render, whatever the media size
+PEAK_BUDGET_MB = 16
+
+REPLACEMENTS = {"{{NAME}}": "John Doe", "{{COMPANY}}": "Acme Corporation"}
+
+
+@pytest.mark.parametrize("media_mb", [10, 100])
+def test_streaming_peak_memory_is_bounded(tmp_path, media_mb):
+    template = tmp_path / "template.pptx"
+    output = tmp_path / "output.pptx"
+    generate_deck(str(template), slides=20, media_mb=media_mb)
+
+    tracemalloc.start()
+    try:
+        count = modify_pptx_streaming(str(template), str(output), REPLACEMENTS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count > 0
+    assert output.stat().st_size > media_mb * 1024 * 1024
+    assert peak / 1024 / 1024 < PEAK_BUDGET_MB
@@ -0,0 +1,74 @@
+"""
+Template optimization: merging fragmented runs in a paragraph.
+"""
+
+from lxml import etree
+
+from optimize import _run_signature, defragment_paragraph
+
+_A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+
+
+def paragraph(body):
+    return etree.fromstring(f'<a:p xmlns:a="{_A_NS}">{body}</a:p>')
+
+
+def runs(p):
+    """(text, rPr attributes) of each run in a paragraph."""
+    result = []
+    for run in p.iter(f'{{{_A_NS}}}r'):
+        rPr = run.find(f'{{{_A_NS}}}rPr')
+        result.append((run.findtext(f'{{{_A_NS}}}t'), dict(rPr.attrib) if rPr is not None else None))
+    return result
+
+
+def test_merges_runs_split_by_proofing_marks():
+    p = paragraph('<a:r><a:rPr lang="en-US" dirty="0"/><a:t>{{cust</a:t></a:r>'
+                  '<a:proofErr type="spellStart"/>'
+                  '<a:r><a:rPr lang="en-US" err="1"/><a:t>omer</a:t></a:r>'
+                  '<a:proofErr type="spellEnd"/>'
+                  '<a:r><a:rPr lang="en-US" smtClean="0"/><a:t>}}</a:t></a:r>')
+
+    assert defragment_paragraph(p) == 2
+    assert runs(p) == [('{{customer}}', {'lang': 'en-US'})]
+    assert not p.findall(f'{{{_A_NS}}}proofErr')
+
+
+def test_breaks_and_fields_end_a_merge():
+    p = paragraph('<a:r><a:t>one</a:t></a:r><a:br/><a:r><a:t>two</a:t></a:r>'
+                  '<a:fld id="{00000000-0000-0000-0000-000000000000}" type="slidenum"><a:t>1</a:t></a:fld>'
+                  '<a:r><a:t>three</a:t></a:r><a:r><a:t>four</a:t></a:r>')
+
+    assert defragment_paragraph(p) == 1
+    assert [text for text, _ in runs(p)] == ['one', 'two', 'threefour']
+    assert [etree.QName(child).localname for child in p] == ['r', 'br', 'r', 'fld', 'r']
+
+
+def test_drops_empty_runs():
+    p = paragraph('<a:r><a:rPr b="1"/><a:t>bold</a:t></a:r>'
+                  '<a:r><a:rPr i="1"/><a:t></a:t></a:r>'
+                  '<a:r><a:rPr/></a:r>'
+                  '<a:r><a:rPr b="1"/><a:t> text</a:t></a:r>')
+
+    assert defragment_paragraph(p) == 3
+    assert runs(p) == [('bold text', {'b': '1'})]
+
+
+def test_keeps_differently_formatted_runs_apart():
+    p = paragraph('<a:r><a:rPr lang="en-US" b="1"/><a:t>bold</a:t></a:r>'
+                  '<a:r><a:rPr lang="en-US"/><a:t> plain</a:t></a:r>'
+                  '<a:r><a:rPr lang="en-US"><a:solidFill><a:srgbClr val="FF0000"/></a:solidFill></a:rPr>'
+                  '<a:t> red</a:t></a:r>'
+                  '<a:r><a:t> default</a:t></a:r>')
+
+    assert defragment_paragraph(p) == 0
+    assert [text for text, _ in runs(p)] == ['bold', ' plain', ' red', ' default']
+
+
+def test_run_signature_leaves_the_run_unchanged():
+    p = paragraph('<a:r><a:rPr lang="en-US" dirty="0" err="1"/><a:t>text</a:t></a:r>')
+    before = etree.tostring(p)
+
+    _run_signature(p[0])
+
+    assert etree.tostring(p) == before
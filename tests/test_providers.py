@@ -0,0 +1,84 @@
+"""
+Callable replacement values are computed lazily and at most once.
+"""
+
+from dataclasses import dataclass
+
+from pptx import Presentation
+
+from main import Replacer, load_provider, modify_pptx
+
+
+@dataclass
+class Lookup:
+    """An unhashable provider object."""
+    value: str
+    calls: int = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def make_deck(path, titles):
+    prs = Presentation()
+    for title in titles:
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = title
+    prs.save(path)
+
+
+def test_unhashable_provider_objects():
+    lookup = Lookup('Ada')
+    replacer = Replacer({'{{NAME}}': lookup}, cache={})
+
+    assert replacer.replace('{{NAME}} and {{NAME}}') == ('Ada and Ada', 1)
+    assert replacer.replace('{{NAME}}') == ('Ada', 1)
+    assert lookup.calls == 1
+
+
+def test_unmatched_keys_are_never_computed(tmp_path):
+    template = tmp_path / "template.pptx"
+    make_deck(template, ["Hello {{NAME}}"] * 3)
+    name, total = Lookup('Ada'), Lookup('42')
+
+    count = modify_pptx(str(template), str(tmp_path / "out.pptx"), {'{{NAME}}': name, '{{TOTAL}}': total})
+
+    assert count == 3
+    assert (name.calls, total.calls) == (1, 0)
+
+
+def test_computed_once_across_rows(tmp_path):
+    template = tmp_path / "template.pptx"
+    make_deck(template, ["Intro {{TOTAL}}", "{{repeat}}{{NAME}}: {{TOTAL}}"])
+    total = Lookup('42')
+    rows = [{'{{NAME}}': name} for name in ('Ada', 'Bob', 'Cy')]
+
+    modify_pptx(str(template), str(tmp_path / "out.pptx"), {'{{TOTAL}}': total}, rows=rows)
+
+    assert total.calls == 1
+    titles = [slide.shapes.title.text for slide in Presentation(str(tmp_path / "out.pptx")).slides]
+    assert titles == ["Intro 42", "Ada: 42", "Bob: 42", "Cy: 42"]
+
+
+def test_value_cache_is_shared_between_renders(tmp_path):
+    template = tmp_path / "template.pptx"
+    make_deck(template, ["{{TOTAL}}"])
+    total = Lookup('42')
+    cache = {}
+
+    for number in range(3):
+        modify_pptx(str(template), str(tmp_path / f"out{number}.pptx"), {'{{TOTAL}}': total},
+                    value_cache=cache)
+    assert total.calls == 1
+
+    # Without a shared cache, each render computes the value again
+    modify_pptx(str(template), str(tmp_path / "out.pptx"), {'{{TOTAL}}': total})
+    assert total.calls == 2
+
+
+def test_provider_spec_is_called_lazily():
+    provider = load_provider({'provider': 'os.path:join', 'args': ['a', 'b']})
+
+    assert Replacer({'{{PATH}}': provider, '{{X}}': 'x'}).replace('{{X}}') == ('x', 1)
+    assert Replacer({'{{PATH}}': provider}).replace('{{PATH}}')[0].replace('\\', '/') == 'a/b'
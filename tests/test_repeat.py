@@ -0,0 +1,83 @@
+"""
+Data rows for --data are loaded as strings whatever their JSON type.
+"""
+
+import json
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from main import modify_pptx
+from repeat import load_rows
+
+
+def test_json_values_are_stringified(tmp_path):
+    data = tmp_path / "rows.json"
+    data.write_text(json.dumps([{"{{NAME}}": "Ada", "{{AGE}}": 36, "{{VIP}}": True, "{{NOTE}}": None}]))
+
+    assert load_rows(str(data)) == [{"{{NAME}}": "Ada", "{{AGE}}": "36", "{{VIP}}": "True", "{{NOTE}}": ""}]
+
+
+def test_short_and_long_csv_rows(tmp_path):
+    data = tmp_path / "rows.csv"
+    data.write_text("{{NAME}},{{AGE}}\nAda,36,extra\nBob\n")
+
+    assert load_rows(str(data)) == [{"{{NAME}}": "Ada", "{{AGE}}": "36"}, {"{{NAME}}": "Bob", "{{AGE}}": ""}]
+
+
+def test_render_with_numeric_json_rows(tmp_path):
+    template = tmp_path / "template.pptx"
+    output = tmp_path / "output.pptx"
+    data = tmp_path / "rows.json"
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "{{repeat}}{{NAME}} is {{AGE}}"
+    prs.save(template)
+    data.write_text(json.dumps([{"{{NAME}}": "Ada", "{{AGE}}": 36}, {"{{NAME}}": "Bob", "{{AGE}}": 41.5}]))
+
+    modify_pptx(str(template), str(output), {}, rows=load_rows(str(data)))
+
+    titles = [slide.shapes.title.text for slide in Presentation(str(output)).slides]
+    assert titles == ["Ada is 36", "Bob is 41.5"]
+
+
+def make_notes_template(path):
+    prs = Presentation()
+    for title, notes in (("Intro {{TITLE}}", "Intro notes {{NAME}}"),
+                         ("{{repeat}}{{NAME}}", "Say hello to {{NAME}}")):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = title
+        slide.notes_slide.notes_text_frame.text = notes
+    prs.save(path)
+
+
+def test_clones_keep_their_notes(tmp_path):
+    template = tmp_path / "template.pptx"
+    output = tmp_path / "output.pptx"
+    make_notes_template(template)
+    rows = [{"{{NAME}}": "Ada"}, {"{{NAME}}": "Bob"}]
+
+    count = modify_pptx(str(template), str(output), {"{{TITLE}}": "Team", "{{NAME}}": "everyone"},
+                        rows=rows, parts=('slides', 'notes'))
+
+    prs = Presentation(str(output))
+    notes = [slide.notes_slide.notes_text_frame.text for slide in prs.slides]
+    assert notes == ["Intro notes everyone", "Say hello to Ada", "Say hello to Bob"]
+    # Intro title and notes, then marker, name and notes for each clone
+    assert count == 8
+    # Each clone has its own notes slide, pointing back at it
+    assert len({slide.notes_slide.part for slide in prs.slides}) == 3
+    for slide in prs.slides:
+        assert slide.notes_slide.part.part_related_by(RT.SLIDE) is slide.part
+
+
+def test_clone_notes_are_copied_as_is_without_notes_part(tmp_path):
+    template = tmp_path / "template.pptx"
+    output = tmp_path / "output.pptx"
+    make_notes_template(template)
+
+    modify_pptx(str(template), str(output), {}, rows=[{"{{NAME}}": "Ada"}])
+
+    slide = Presentation(str(output)).slides[1]
+    assert slide.shapes.title.text == "Ada"
+    assert slide.notes_slide.notes_text_frame.text == "Say hello to {{NAME}}"
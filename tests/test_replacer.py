@@ -0,0 +1,44 @@
+"""
+Replacer applies keys in order with str.replace, like the original engine.
+"""
+
+import pytest
+
+from main import Replacer, count_hits
+
+
+def replace_text(text, replacements):
+    """The engine's original per-run loop, kept as the reference behaviour."""
+    count = 0
+    for old_text, new_text in replacements.items():
+        if old_text in text:
+            text = text.replace(old_text, new_text)
+            count += 1
+    return text, count
+
+
+@pytest.mark.parametrize('replacements, text', [
+    ({'{{NAME}}': 'Ada', '{{CITY}}': 'Paris'}, 'Dear {{NAME}} from {{CITY}}, {{NAME}}!'),
+    ({'{{A}}': '{{B}}', '{{B}}': 'x'}, '{{A}} and {{B}}'),
+    ({'{{B}}': 'x', '{{A}}': '{{B}}'}, '{{A}} and {{B}}'),
+    ({'NAME': 'Ada', 'NAME_FULL': 'Ada Lovelace'}, 'NAME_FULL'),
+    ({'NAME_FULL': 'Ada Lovelace', 'NAME': 'Ada'}, 'NAME_FULL'),
+    ({'{{NAME}}': 'Ada'}, 'No placeholder here'),
+])
+def test_matches_the_original_engine(replacements, text):
+    assert Replacer(replacements).replace(text) == replace_text(text, replacements)
+
+
+def test_chained_replacement_follows_file_order():
+    assert Replacer({'{{A}}': '{{B}}', '{{B}}': 'x'}).replace('{{A}}') == ('x', 2)
+    assert Replacer({'{{B}}': 'x', '{{A}}': '{{B}}'}).replace('{{A}}') == ('{{B}}', 1)
+
+
+def test_empty_keys_are_ignored():
+    assert Replacer({'': 'x', '{{A}}': 'a'}).replace('{{A}}') == ('a', 1)
+    assert Replacer({}).replace('text') == ('text', 0)
+
+
+def test_count_hits():
+    hits = count_hits(['{{NAME}} {{NAME}}', 'NAME_FULL'], ['{{NAME}}', 'NAME', 'NAME_FULL', '{{CITY}}', ''])
+    assert hits == {'{{NAME}}': 2, 'NAME': 3, 'NAME_FULL': 1, '{{CITY}}': 0}
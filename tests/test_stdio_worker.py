@@ -0,0 +1,77 @@
+"""
+Jobs run by the --stdio worker accept the same options as render().
+"""
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from stdio_worker import TemplateCache, run_job
+
+
+def make_template(path, slides=3):
+    prs = Presentation()
+    for number in range(1, slides + 1):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {number} for {{{{NAME}}}}"
+        slide.notes_slide.notes_text_frame.text = "Notes for {{NAME}}"
+        table = slide.shapes.add_table(2, 2, Inches(1), Inches(2), Inches(4), Inches(1))
+        table.name = f"Table{number}"
+    prs.save(path)
+
+
+def test_job_options_reach_modify_pptx(tmp_path):
+    template = tmp_path / "template.pptx"
+    output = tmp_path / "output.pptx"
+    make_template(template)
+
+    result = run_job({
+        'id': 1,
+        'template': str(template),
+        'output': str(output),
+        'replacements': {'{{NAME}}': 'Ada'},
+        'options': {
+            'slides': '2-3',
+            'parts': 'slides,notes',
+            'tables': {'Table2': [['a', 'b'], ['c', None]]},
+        },
+    }, TemplateCache())
+
+    assert result['ok'], result.get('error')
+    assert result['replacements'] == 4
+    prs = Presentation(str(output))
+    assert [slide.shapes.title.text for slide in prs.slides] == ["Slide 2 for Ada", "Slide 3 for Ada"]
+    assert prs.slides[0].notes_slide.notes_text_frame.text == "Notes for Ada"
+    table = next(shape for shape in prs.slides[0].shapes if shape.name == 'Table2').table
+    assert [table.cell(2, 0).text, table.cell(2, 1).text] == ['c', '']
+
+
+def test_cached_template_and_unknown_options(tmp_path):
+    template = tmp_path / "template.pptx"
+    make_template(template, slides=1)
+    templates = TemplateCache()
+
+    for number in range(2):
+        result = run_job({'template': str(template), 'output': str(tmp_path / f"out{number}.pptx"),
+                          'replacements': {'{{NAME}}': 'Ada'}}, templates)
+        assert result['ok'] and result['replacements'] == 1
+        assert set(result['timings']) == {'load', 'render', 'total'}
+
+    result = run_job({'template': str(template), 'output': str(tmp_path / "bad.pptx"),
+                      'replacements': {}, 'options': {'parts': 'notes,footers'}}, templates)
+    assert not result['ok']
+    assert 'footers' in result['error']
+
+
+def test_providers_in_jobs_must_be_allowed(tmp_path):
+    template = tmp_path / "template.pptx"
+    make_template(template, slides=1)
+    job = {'template': str(template), 'output': str(tmp_path / "out.pptx"),
+           'replacements': {'{{NAME}}': {'provider': 'os.path:join', 'args': ['a', 'b']}}}
+
+    result = run_job(job, TemplateCache())
+    assert not result['ok']
+    assert "not allowed" in result['error']
+
+    for allowed in (['os.path'], ['os.path:join']):
+        assert run_job(job, TemplateCache(), allowed_providers=allowed)['ok']
+    assert not run_job(job, TemplateCache(), allowed_providers=['os.path:split'])['ok']
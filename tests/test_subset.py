@@ -0,0 +1,69 @@
+"""
+Invalid --slides selections are reported as errors, not tracebacks.
+"""
+
+import sys
+import zipfile
+
+import pytest
+from pptx import Presentation
+from pptx.enum.action import PP_ACTION
+
+import main
+from subset import check_selection, extract_slides
+
+
+@pytest.fixture
+def deck(tmp_path):
+    path = tmp_path / "deck.pptx"
+    prs = Presentation()
+    for _ in range(3):
+        prs.slides.add_slide(prs.slide_layouts[5])
+    prs.save(path)
+    return str(path)
+
+
+def test_check_selection(deck):
+    assert check_selection(deck, '1,3') == [1, 3]
+    for selection in ('3-1', '4', 'Appendix', ''):
+        with pytest.raises(ValueError):
+            check_selection(deck, selection)
+
+
+def test_invalid_slides_option_exits_cleanly(deck, tmp_path, monkeypatch, capsys):
+    config = tmp_path / "config.json"
+    config.write_text('{"replacements": {"{{NAME}}": "Ada"}}')
+    monkeypatch.setattr(sys, 'argv', ['pptmod', deck, '-c', str(config), '--slides', '2-9'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.main()
+
+    assert exit_info.value.code == 1
+    assert "Error: Invalid --slides '2-9': Slide 4 does not exist" in capsys.readouterr().err
+
+
+def test_links_to_unselected_slides_are_dropped(tmp_path):
+    template = tmp_path / "linked.pptx"
+    output = tmp_path / "output.pptx"
+    prs = Presentation()
+    for number in range(1, 6):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {number} for {{{{NAME}}}}"
+    prs.slides[0].shapes.title.click_action.target_slide = prs.slides[4]
+    prs.slides[1].shapes.title.click_action.target_slide = prs.slides[0]
+    prs.save(template)
+
+    with zipfile.ZipFile(extract_slides(str(template), '1-2')) as reduced:
+        assert 'ppt/slides/slide5.xml' not in reduced.namelist()
+        assert b'slide5.xml' not in reduced.read('ppt/slides/_rels/slide1.xml.rels')
+        assert b'hlinkClick' not in reduced.read('ppt/slides/slide1.xml')
+
+    count = main.modify_pptx(str(template), str(output), {'{{NAME}}': 'Ada'}, slides='1-2')
+
+    assert count == 2
+    with zipfile.ZipFile(output) as package:
+        assert 'ppt/slides/slide5.xml' not in package.namelist()
+    prs = Presentation(str(output))
+    # The link between two selected slides is kept
+    assert prs.slides[1].shapes.title.click_action.target_slide == prs.slides[0]
+    assert prs.slides[0].shapes.title.click_action.action == PP_ACTION.NONE
@@ -0,0 +1,90 @@
+"""
+Table binding: data loading, resizing, formatting and cell text.
+"""
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from tables import bind_table, bind_tables, load_table_data
+
+
+def make_table(rows=3, columns=2, header=True):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shape = slide.shapes.add_table(rows, columns, Inches(1), Inches(1), Inches(4), Inches(1))
+    shape.name = 'Prices'
+    table = shape.table
+    table.first_row = header
+    for column in range(columns):
+        table.cell(0, column).text = f"Header {column}"
+    table.cell(1, 0).text = "template"
+    table.cell(1, 0).text_frame.paragraphs[0].runs[0].font.bold = True
+    return prs, shape
+
+
+def cell_texts(shape):
+    return [[cell.text for cell in row.cells] for row in shape.table.rows]
+
+
+def test_load_table_data(tmp_path):
+    csv_path = tmp_path / "prices.csv"
+    csv_path.write_text("sku,price\nA1,9.99\nB2,\n")
+
+    assert load_table_data(str(csv_path)) == [['A1', '9.99'], ['B2', '']]
+    assert load_table_data([['A1', 9.99], ['B2', None]]) == [['A1', '9.99'], ['B2', '']]
+    assert load_table_data({'sku': ['A1', 'B2'], 'price': [1, 2]}) == [['A1', '1'], ['B2', '2']]
+    with pytest.raises(ValueError):
+        load_table_data({'sku': ['A1', 'B2'], 'price': [1]})
+
+
+def test_header_is_kept_and_table_grows():
+    prs, shape = make_table()
+    height = shape.height
+
+    assert bind_table(shape, [['A', '1'], ['B', '2'], ['C', '3'], ['D']]) == 7
+
+    assert cell_texts(shape) == [['Header 0', 'Header 1'], ['A', '1'], ['B', '2'], ['C', '3'], ['D', '']]
+    # Data rows are copied from the first one, formatting included
+    assert all(row.cells[0].text_frame.paragraphs[0].runs[0].font.bold for row in list(shape.table.rows)[1:])
+    assert shape.height > height
+
+
+def test_table_shrinks_without_header():
+    prs, shape = make_table(rows=4, header=False)
+
+    bind_table(shape, [['only', 'row']])
+
+    assert cell_texts(shape) == [['only', 'row']]
+
+
+def test_too_many_columns_are_rejected():
+    prs, shape = make_table()
+
+    with pytest.raises(ValueError, match="3 values"):
+        bind_table(shape, [['A', '1', 'extra']])
+
+
+def test_cell_text_like_python_pptx():
+    prs, shape = make_table()
+
+    bind_table(shape, [['two\nlines', 'soft\vbreak'], ['bell\x07', 'crlf\r\nline']])
+
+    rows = list(shape.table.rows)
+    first, second = rows[1].cells
+    assert [paragraph.text for paragraph in first.text_frame.paragraphs] == ['two', 'lines']
+    assert all(paragraph.runs[0].font.bold for paragraph in first.text_frame.paragraphs)
+    assert len(second.text_frame.paragraphs) == 1
+    assert second.text_frame._txBody.xpath('.//a:br')
+    assert second.text == 'soft\vbreak'
+    assert '_x0007_' in rows[2].cells[0].text_frame._txBody.xpath('string(.//a:t)')
+    assert [paragraph.text for paragraph in rows[2].cells[1].text_frame.paragraphs] == ['crlf', 'line']
+
+
+def test_bind_tables_by_name():
+    prs, shape = make_table()
+
+    assert bind_tables(prs, {'Prices': {'sku': ['A'], 'price': [1.5]}}) == 2
+    assert cell_texts(shape)[1:] == [['A', '1.5']]
+    with pytest.raises(ValueError, match="No table named 'Costs'"):
+        bind_tables(prs, {'Costs': []})
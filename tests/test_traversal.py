@@ -0,0 +1,117 @@
+"""
+Text replacement over package parts: group shapes, notes, layouts, masters and SmartArt.
+"""
+
+import sys
+import zipfile
+
+import pytest
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+from pptx.util import Inches
+
+import main
+from main import PART_TYPES, modify_pptx, modify_pptx_streaming, parse_parts
+
+REPLACEMENTS = {'{{NAME}}': 'Ada'}
+
+DIAGRAM_DATA = (
+    '<dgm:dataModel xmlns:dgm="http://schemas.openxmlformats.org/drawingml/2006/diagram" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><dgm:ptLst>'
+    '<dgm:pt modelId="1"><dgm:t><a:bodyPr/><a:p><a:r><a:t>Smart {{NAME}}</a:t></a:r></a:p></dgm:t></dgm:pt>'
+    '</dgm:ptLst></dgm:dataModel>'
+).encode()
+
+
+@pytest.fixture
+def deck(tmp_path):
+    """A deck with a placeholder in each kind of part."""
+    path = tmp_path / "deck.pptx"
+    prs = Presentation()
+    prs.slide_master.placeholders[0].text_frame.text = "Master {{NAME}}"
+    layout = prs.slide_layouts[5]
+    layout.placeholders[0].text_frame.text = "Layout {{NAME}}"
+
+    slide = prs.slides.add_slide(layout)
+    slide.shapes.title.text = "Hello {{NAME}}"
+    outer = slide.shapes.add_group_shape()
+    inner = outer.shapes.add_group_shape()
+    inner.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1)).text_frame.text = "Nested {{NAME}}"
+    table = slide.shapes.add_table(1, 1, Inches(1), Inches(3), Inches(2), Inches(1)).table
+    table.cell(0, 0).text = "Cell {{NAME}}"
+    slide.notes_slide.notes_text_frame.text = "Notes {{NAME}}"
+
+    diagram = Part(PackURI('/ppt/diagrams/data1.xml'), CT.DML_DIAGRAM_DATA, slide.part.package, DIAGRAM_DATA)
+    slide.part.relate_to(diagram, RT.DIAGRAM_DATA)
+    prs.save(path)
+    return str(path)
+
+
+def package_text(path, name):
+    with zipfile.ZipFile(path) as package:
+        return package.read(name).decode()
+
+
+def test_default_parts_are_slides_only(deck, tmp_path):
+    output = str(tmp_path / "out.pptx")
+
+    assert modify_pptx(deck, output, REPLACEMENTS) == 3
+
+    slide = package_text(output, 'ppt/slides/slide1.xml')
+    assert '{{NAME}}' not in slide and slide.count('Ada') == 3
+    assert 'Notes {{NAME}}' in package_text(output, 'ppt/notesSlides/notesSlide1.xml')
+    assert 'Smart {{NAME}}' in package_text(output, 'ppt/diagrams/data1.xml')
+
+
+@pytest.mark.parametrize('engine', [modify_pptx, modify_pptx_streaming])
+def test_all_parts(deck, tmp_path, engine):
+    output = str(tmp_path / "out.pptx")
+
+    assert engine(deck, output, REPLACEMENTS, parts=tuple(PART_TYPES)) == 7
+
+    assert 'Notes Ada' in package_text(output, 'ppt/notesSlides/notesSlide1.xml')
+    assert 'Layout Ada' in package_text(output, 'ppt/slideLayouts/slideLayout6.xml')
+    assert 'Master Ada' in package_text(output, 'ppt/slideMasters/slideMaster1.xml')
+    # SmartArt parts are held as bytes by python-pptx and must be written back
+    assert 'Smart Ada' in package_text(output, 'ppt/diagrams/data1.xml')
+
+
+def test_control_characters_are_escaped(deck, tmp_path):
+    output = str(tmp_path / "out.pptx")
+
+    modify_pptx(deck, output, {'{{NAME}}': 'Ada\x0bLovelace\x07'})
+
+    slide = package_text(output, 'ppt/slides/slide1.xml')
+    assert 'Hello Ada_x000B_Lovelace_x0007_' in slide
+
+
+def test_parse_parts():
+    assert parse_parts('notes') == ('notes',)
+    assert parse_parts(' slides, notes ') == ('slides', 'notes')
+    assert parse_parts('all') == tuple(PART_TYPES)
+    assert parse_parts(['layouts']) == ('layouts',)
+    for invalid in ('', ',', 'slides,footers', ['slide']):
+        with pytest.raises(ValueError):
+            parse_parts(invalid)
+
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['pptmod', *args])
+    main.main()
+
+
+def test_parts_option(deck, tmp_path, monkeypatch, capsys):
+    config = tmp_path / "config.json"
+    config.write_text('{"replacements": {"{{NAME}}": "Ada"}}')
+    output = str(tmp_path / "out.pptx")
+
+    run_cli(monkeypatch, deck, '-c', str(config), '-o', output, '--parts', 'notes,diagrams')
+    assert "Made 2 text replacements" in capsys.readouterr().out
+    assert 'Hello {{NAME}}' in package_text(output, 'ppt/slides/slide1.xml')
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_cli(monkeypatch, deck, '-c', str(config), '-o', output, '--parts', 'notes,footers')
+    assert exit_info.value.code == 1
+    assert "Error: Invalid --parts 'notes,footers'" in capsys.readouterr().err